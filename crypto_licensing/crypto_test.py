@@ -10,6 +10,7 @@ import binascii
 import logging
 import os
 import random
+import pytest
 
 from .misc import timer
 
@@ -32,6 +33,22 @@ except Exception as exc:
 else:
     ed25519_mods.append( ("ed25519ll from Pypi", ed25519ll) )
 
+try:  # The OpenSSL-backed cryptography package from Pypi
+    from . import ed25519_cryptography
+    ed25519_cryptography.crypto_sign
+except Exception as exc:
+    log.warning( "Could not load .ed25519_cryptography: {exc}".format( exc=exc ))
+else:
+    ed25519_mods.append( ("cryptography (OpenSSL) from Pypi", ed25519_cryptography) )
+
+try:  # The libsodium-backed PyNaCl package from Pypi
+    from . import ed25519_nacl
+    ed25519_nacl.crypto_sign
+except Exception as exc:
+    log.warning( "Could not load .ed25519_nacl: {exc}".format( exc=exc ))
+else:
+    ed25519_mods.append( ("PyNaCl (libsodium) from Pypi", ed25519_nacl) )
+
 try:  # The Python-only bindings from https://github.com/dholth/ed25519ll
     from . import ed25519ll_pyonly
     ed25519ll_pyonly.crypto_sign
@@ -48,7 +65,7 @@ except Exception as exc:
 else:
     ed25519_mods.append( ("Daniel J. Bernstein's Reference", ed25519_djb) )
 
-assert 2 <= len(ed25519_mods) <= 4, \
+assert 2 <= len(ed25519_mods) <= 6, \
     "Incorrect number of ed25519 implementations found"
 
 
@@ -145,3 +162,66 @@ def test_ed25519():
 
             log.normal("\n{dsc}: Completed {cnt} signatures/checks in {dur}s, or {per:.5}/s".format(
                 dsc=description, cnt=cnt, dur=dur, per=cnt/dur ))
+
+
+def test_ed25519_batch():
+    for description,ed in ed25519_mods:
+        if not hasattr( ed, 'crypto_sign_open_batch' ):
+            continue
+        log.detail("\n\nTesting batch: {}\n".format(description))
+        with open( os.path.join( os.path.dirname( __file__ ), "crypto_test.input" )) as cases:
+            signeds,vks		= [],[]
+            for line in cases:
+                x		= line.split( ':' )
+                vks.append( binascii.unhexlify( x[1] ))
+                signeds.append( binascii.unhexlify( x[3] ))
+                if len( signeds ) >= 8:
+                    break
+        # An empty batch trivially succeeds
+        assert ed.crypto_sign_open_batch( [], [] ) == []
+
+        beg = timer()
+        assert ed.crypto_sign_open_batch( signeds, vks ) == [ signed[ed.SIGNATUREBYTES:] for signed in signeds ]
+        dur = timer() - beg
+
+        # Any forged signature or message fails the batch; detected individually, raising ValueError
+        forged		= random.randrange( len( signeds ))
+        forgederror	= random.randrange( len( signeds[forged] ))
+        signeds[forged]	= asbytes( c ^ ( 1 << random.randrange(8)
+                                         if i == forgederror
+                                         else 0 )
+                                   for i,c in enumerate( asints( signeds[forged] )))
+        forgedsuccess	= 0
+        try:
+            ed.crypto_sign_open_batch( signeds, vks )
+            forgedsuccess = 1
+        except Exception:
+            pass
+        assert not forgedsuccess
+
+        log.normal("\n{dsc}: Completed batch of {cnt} checks in {dur}s, or {per:.5}/s".format(
+            dsc=description, cnt=len( signeds ), dur=dur, per=len( signeds )/dur ))
+
+
+def test_ed25519_batch_cofactored():
+    """The Python-only batch verification uses the cofactored equation, so accepts a signature whose R
+    has a small-order component, which the (cofactorless) individual verification rejects.  Only
+    the holder of the signing key can produce such a signature."""
+    djbec			= ed25519ll_pyonly.djbec
+    keypair			= ed25519ll_pyonly.crypto_sign_keypair( b'\x01' * 32 )
+    sk,vk			= keypair.sk[:32], keypair.vk
+    m				= b"small-order R"
+    h				= djbec.H( sk )
+    a				= djbec.secretint( h )
+    r				= djbec.Hint( h[32:64] + m )
+    T				= [ 0, djbec.q - 1 ]		# The point of order 2
+    R				= djbec.pt_unxform( djbec.xpt_add_unified(
+        djbec.pt_xform( djbec.scalarmult( djbec.B, r )), djbec.pt_xform( T )))
+    Renc			= djbec.encodepoint( R )
+    S				= ( r + djbec.Hint( Renc + vk + m ) * a ) % djbec.l
+    signed			= Renc + djbec.encodeint( S ) + m
+
+    good			= ed25519ll_pyonly.crypto_sign( b"ordinary", keypair.sk )
+    assert ed25519ll_pyonly.crypto_sign_open_batch( [ good, signed ], [ vk, vk ] ) == [ b"ordinary", m ]
+    with pytest.raises( ValueError ):
+        ed25519ll_pyonly.crypto_sign_open( signed, vk )
@@ -18,20 +18,42 @@ import warnings
 
 # We require that at least the basic dholth/ed25519ll API must be available
 __all__ = [
-    'crypto_sign', 'crypto_sign_open', 'crypto_sign_keypair', 'Keypair',
+    'crypto_sign', 'crypto_sign_open', 'crypto_sign_open_batch', 'crypto_sign_keypair', 'Keypair',
     'PUBLICKEYBYTES', 'SECRETKEYBYTES', 'SIGNATUREBYTES'
 ]
 
-# Get Ed25519 support. Try a globally installed ed25519ll possibly with a CTypes binding
+# Get Ed25519 support.  Prefer libsodium's optimized (and constant-time) implementation via PyNaCl
 try:
-    from ed25519ll import *
-except Exception: # If not installed/built correctly, may have various errors...
-    # Otherwise, try our local Python-only ed25519ll derivation
+    from ..ed25519_nacl import *
+except ImportError:
+    # Otherwise, OpenSSL's (also constant-time) implementation via cryptography; about 1/2 as fast
     try:
-        from ..ed25519ll_pyonly import *
+        from ..ed25519_cryptography import *
     except ImportError:
-        # Fall back to the very slow D.J.Bernstein Python reference implementation
-        from ..ed25519_djb import *
+        # Otherwise, try a globally installed ed25519ll possibly with a CTypes binding
+        try:
+            from ed25519ll import *
+        except Exception: # If not installed/built correctly, may have various errors...
+            # Otherwise, try our local Python-only ed25519ll derivation
+            try:
+                from ..ed25519ll_pyonly import *
+            except ImportError:
+                # Fall back to the very slow D.J.Bernstein Python reference implementation
+                from ..ed25519_djb import *
+
+# If the selected implementation doesn't provide batch verification, verify each individually.
+# BATCHED indicates whether crypto_sign_open_batch is any faster than crypto_sign_open on each.
+try:
+    crypto_sign_open_batch
+except NameError:
+    BATCHED			= False
+
+    def crypto_sign_open_batch( signeds, vks ):
+        """Return the messages given a sequence of signature+messages and corresponding verifying
+        keys, raising ValueError for the first invalid signature."""
+        return [ crypto_sign_open( signed, vk ) for signed, vk in zip( signeds, vks ) ]
+else:
+    BATCHED			= True
 
 # Disable warnings about seed source; we expect to provide cryptographically secure randomness
 warnings.filterwarnings( action="ignore", category=RuntimeWarning, module=__name__ )
@@ -0,0 +1,70 @@
+#
+# pyca/cryptography (OpenSSL) implementation of ed25519 signatures, w/ the ed25519ll API
+#
+# To use it, install the Python cryptography package using:
+#
+#    python3 -m pip install cryptography
+#
+
+import os
+
+from collections import namedtuple
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+__all__ = ['crypto_sign', 'crypto_sign_open', 'crypto_sign_keypair', 'Keypair',
+           'SEEDVALUEBYTES', 'PUBLICKEYBYTES', 'SECRETKEYBYTES', 'SIGNATUREBYTES']
+
+SEEDVALUEBYTES = 32
+PUBLICKEYBYTES = 32
+SECRETKEYBYTES = 64
+SIGNATUREBYTES = 64
+
+Keypair = namedtuple('Keypair', ('vk', 'sk'))  # verifying key, secret key
+
+
+def _publickey(seed):
+    return Ed25519PrivateKey.from_private_bytes(seed).public_key().public_bytes(
+        Encoding.Raw, PublicFormat.Raw)
+
+
+def crypto_sign_keypair(seed=None):
+    """Return (verifying, secret) key from a given seed, or os.urandom(32), or re-confirm provided
+    secret key.
+
+    """
+    if seed is None:
+        seed = os.urandom(SEEDVALUEBYTES)
+    if len(seed) == SEEDVALUEBYTES:
+        vkbytes = _publickey(seed)
+    elif len(seed) == SECRETKEYBYTES:
+        vkbytes = _publickey(seed[:SEEDVALUEBYTES])
+        if vkbytes != seed[SEEDVALUEBYTES:]:
+            raise ValueError("Provided secret key did not contain expected public key")
+        seed = seed[:SEEDVALUEBYTES]
+    else:
+        raise ValueError("seed must be 32-byte random value or None.")
+    return Keypair(vkbytes, seed + vkbytes)
+
+
+def crypto_sign(msg, sk):
+    """Return signature+message given message and secret key.
+    The signature is the first SIGNATUREBYTES bytes of the return value.
+    A copy of msg is in the remainder."""
+    if len(sk) != SECRETKEYBYTES:
+        raise ValueError("Bad signing key length %d" % len(sk))
+    return Ed25519PrivateKey.from_private_bytes(sk[:SEEDVALUEBYTES]).sign(msg) + msg
+
+
+def crypto_sign_open(signed, vk):
+    """Return message given signature+message and the verifying key."""
+    if len(vk) != PUBLICKEYBYTES:
+        raise ValueError("Bad verifying key length %d" % len(vk))
+    msg = signed[SIGNATUREBYTES:]
+    try:
+        Ed25519PublicKey.from_public_bytes(vk).verify(signed[:SIGNATUREBYTES], msg)
+    except InvalidSignature as exc:
+        raise ValueError("Signature verification failed: %s" % exc)
+    return msg
@@ -0,0 +1,62 @@
+#
+# PyNaCl (libsodium) implementation of ed25519 signatures, w/ the ed25519ll API
+#
+# To use it, install the Python PyNaCl package using:
+#
+#    python3 -m pip install pynacl
+#
+
+import os
+
+from collections import namedtuple
+
+from nacl.bindings import (
+    crypto_sign_seed_keypair, crypto_sign as _crypto_sign, crypto_sign_open as _crypto_sign_open
+)
+
+__all__ = ['crypto_sign', 'crypto_sign_open', 'crypto_sign_keypair', 'Keypair',
+           'SEEDVALUEBYTES', 'PUBLICKEYBYTES', 'SECRETKEYBYTES', 'SIGNATUREBYTES']
+
+SEEDVALUEBYTES = 32
+PUBLICKEYBYTES = 32
+SECRETKEYBYTES = 64
+SIGNATUREBYTES = 64
+
+Keypair = namedtuple('Keypair', ('vk', 'sk'))  # verifying key, secret key
+
+
+def crypto_sign_keypair(seed=None):
+    """Return (verifying, secret) key from a given seed, or os.urandom(32), or re-confirm provided
+    secret key.
+
+    """
+    if seed is None:
+        seed = os.urandom(SEEDVALUEBYTES)
+    if len(seed) == SEEDVALUEBYTES:
+        vkbytes, skbytes = crypto_sign_seed_keypair(seed)
+    elif len(seed) == SECRETKEYBYTES:
+        vkbytes, skbytes = crypto_sign_seed_keypair(seed[:SEEDVALUEBYTES])
+        if vkbytes != seed[SEEDVALUEBYTES:]:
+            raise ValueError("Provided secret key did not contain expected public key")
+    else:
+        raise ValueError("seed must be 32-byte random value or None.")
+    return Keypair(vkbytes, skbytes)
+
+
+def crypto_sign(msg, sk):
+    """Return signature+message given message and secret key.
+    The signature is the first SIGNATUREBYTES bytes of the return value.
+    A copy of msg is in the remainder."""
+    if len(sk) != SECRETKEYBYTES:
+        raise ValueError("Bad signing key length %d" % len(sk))
+    return _crypto_sign(msg, sk)
+
+
+def crypto_sign_open(signed, vk):
+    """Return message given signature+message and the verifying key."""
+    if len(vk) != PUBLICKEYBYTES:
+        raise ValueError("Bad verifying key length %d" % len(vk))
+    try:
+        return _crypto_sign_open(signed, vk)
+    except Exception as exc:  # nacl.exceptions.BadSignatureError, ...
+        raise ValueError("Signature verification failed: %s" % exc)
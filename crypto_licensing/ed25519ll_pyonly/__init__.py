@@ -8,13 +8,14 @@
 #    python3 -m pip install ed25519ll
 #
 
+import binascii
 import warnings
 import os
 
 from collections import namedtuple
 from . import djbec
 
-__all__ = ['crypto_sign', 'crypto_sign_open', 'crypto_sign_keypair', 'Keypair',
+__all__ = ['crypto_sign', 'crypto_sign_open', 'crypto_sign_open_batch', 'crypto_sign_keypair', 'Keypair',
            'SEEDVALUEBYTES', 'PUBLICKEYBYTES', 'SECRETKEYBYTES', 'SIGNATUREBYTES']
 
 SEEDVALUEBYTES=32
@@ -68,3 +69,35 @@ def crypto_sign_open(signed, vk):
         raise ValueError("rc != 0", rc)    
     return signed[SIGNATUREBYTES:]
 
+
+def crypto_sign_open_batch(signeds, vks):
+    """Return the messages given a sequence of signature+messages and corresponding verifying keys,
+    verified together as a batch; much faster than crypto_sign_open on each.  If the batch fails,
+    each is verified individually, raising ValueError for the first invalid signature.
+
+    The batch uses the cofactored verification equation (as do most batch verifiers), so may
+    accept a (maliciously constructed) signature w/ a small-order component that crypto_sign_open
+    would reject.  It never accepts a signature that crypto_sign_open rejects for any other reason.
+    """
+    signeds, vks = list(signeds), list(vks)
+    if len(signeds) != len(vks):
+        raise ValueError("Mismatched signed messages and verifying keys")
+    for vk in vks:
+        if len(vk) != PUBLICKEYBYTES:
+            raise ValueError("Bad verifying key length %d" % len(vk))
+    if not signeds:
+        return []
+    ss = [signed[:SIGNATUREBYTES] for signed in signeds]
+    ms = [signed[SIGNATUREBYTES:] for signed in signeds]
+    # 128-bit random scalars suffice for 128-bit security, and halve the additions of each R_i
+    # (the first may be 1; scaling the whole equation by z_0^-1 leaves its soundness unchanged).
+    # Obtain all their entropy w/ one os.urandom call, as 32 hex digits per z_i.
+    zhex = binascii.hexlify(os.urandom(16 * (len(signeds) - 1)))
+    zs = [1] + [int(zhex[i:i + 32], 16) or 1 for i in range(0, len(zhex), 32)]
+    try:
+        rc = djbec.checkvalid_batch(ss, ms, vks, zs)
+    except Exception:
+        rc = False
+    if not rc:
+        ms = [crypto_sign_open(signed, vk) for signed, vk in zip(signeds, vks)]
+    return ms
@@ -34,6 +34,7 @@ except NameError: # pragma nocover
     def bit(h, i):
         return (h[i//8] >> (i%8)) & 1
 
+import binascii
 import hashlib
 
 b = 256
@@ -43,11 +44,9 @@ l = 2**252 + 27742317777372353535851937790883648493
 def H(m):
     return hashlib.sha512(m).digest()
 
+# The built-in 3-argument pow performs the modular exponentiation in C
 def expmod(b, e, m):
-    if e == 0: return 1
-    t = expmod(b, e // 2, m) ** 2 % m
-    if e & 1: t = (t * b) % m
-    return t
+    return pow(b, e, m)
 
 # Can probably get some extra speedup here by replacing this with
 # an extended-euclidean, but performance seems OK without that
@@ -137,33 +136,35 @@ def xpt_mult (pt, n):
 def scalarmult(pt, e):
     return pt_unxform(xpt_mult(pt_xform(pt), e))
 
+# Little-endian integer <-> bytes conversions, w/o a Python loop over each bit
 def encodeint(y):
-    bits = [(y >> i) & 1 for i in range(b)]
-    e = [(sum([bits[i * 8 + j] << j for j in range(8)]))
-                                    for i in range(b//8)]
-    return asbytes(e)
+    return binascii.unhexlify('%064x' % y)[::-1]
 
 def encodepoint(P):
     x = P[0]
     y = P[1]
-    bits = [(y >> i) & 1 for i in range(b - 1)] + [x & 1]
-    e = [(sum([bits[i * 8 + j] << j for j in range(8)]))
-                                    for i in range(b//8)]
-    return asbytes(e)
-    
+    return encodeint(y | ((x & 1) << (b-1)))
+
+def decodebytes(s):
+    return int(binascii.hexlify(s[::-1]), 16)
+
+def secretint(h):
+    """The clamped secret scalar: bits 3..253 of the hash, w/ bit 254 set"""
+    return 2**(b-2) + (decodebytes(h[0:b//8]) & (2**(b-2) - 8))
+
 def publickey(sk):
     h = H(sk)
-    a = 2**(b-2) + sum(2**i * bit(h,i) for i in range(3,b-2))
+    a = secretint(h)
     A = scalarmult(B,a)
     return encodepoint(A)
 
 def Hint(m):
     h = H(m)
-    return sum(2**i * bit(h,i) for i in range(2*b))
+    return decodebytes(h)
 
 def signature(m,sk,pk):
     h = H(sk)
-    a = 2**(b-2) + sum(2**i * bit(h,i) for i in range(3,b-2))
+    a = secretint(h)
     inter = joinbytes([h[i] for i in range(b//8,b//4)])
     r = Hint(inter + m)
     R = scalarmult(B,r)
@@ -176,21 +177,39 @@ def isoncurve(P):
     return (-x*x + y*y - 1 - d*x*x*y*y) % q == 0
 
 def decodeint(s):
-    return sum(2**i * bit(s,i) for i in range(0,b))
+    return decodebytes(s[0:b//8])
 
 def decodepoint(s):
-    y = sum(2**i * bit(s,i) for i in range(0,b-1))
+    y = decodeint(s) & (2**(b-1) - 1)
     x = xrecover(y)
     if x & 1 != bit(s,b-1): x = q-x
     P = [x,y]
     if not isoncurve(P): raise Exception("decoding point that is not on curve")
     return P
 
+# The same few public keys are verified repeatedly (eg. the authors along a License dependency
+# chain), so remember each one's decoded point, rather than recovering x (a modular square root
+# and inverse) every time.  Bounded, by simply discarding them all when full.
+VKPOINTS_MAX = 1024
+vkpoints = {}
+
+def decodepoint_vk(pk):
+    pk = bytes(pk)
+    try:
+        return vkpoints[pk]
+    except KeyError:
+        pass
+    A = tuple(decodepoint(pk))
+    if len(vkpoints) >= VKPOINTS_MAX:
+        vkpoints.clear()
+    vkpoints[pk] = A
+    return A
+
 def checkvalid(s, m, pk):
     if len(s) != b//4: raise Exception("signature length is wrong")
     if len(pk) != b//8: raise Exception("public-key length is wrong")
     R = decodepoint(s[0:b//8])
-    A = decodepoint(pk)
+    A = decodepoint_vk(pk)
     S = decodeint(s[b//8:b//4])
     h = Hint(encodepoint(R) + pk + m)
     v1 = scalarmult(B,S)
@@ -198,6 +217,71 @@ def checkvalid(s, m, pk):
     v2 = pt_unxform(xpt_add(pt_xform(R), pt_xform(scalarmult(A, h))))
     return v1==v2
 
+# Batch verification.  Checks the cofactored equation for all signatures at once:
+#
+#     [8] ( [sum(z_i*S_i)]B - sum([z_i]R_i) - sum([z_i*h_i]A_i) ) == 0
+#
+# for random scalars z_i.  All terms are summed by one Straus interleaved multi-scalar
+# multiplication, which shares a single run of doublings across every point.  Uses the complete
+# (unified) addition add-2008-hwcd-3; unlike xpt_add, it is correct when adding a point to itself,
+# or to the identity.
+
+def xpt_add_unified(pt1, pt2):
+    (X1, Y1, Z1, T1) = pt1
+    (X2, Y2, Z2, T2) = pt2
+    A = ((Y1-X1)*(Y2-X2)) % q
+    B = ((Y1+X1)*(Y2+X2)) % q
+    C = (T1*2*d*T2) % q
+    D = (Z1*2*Z2) % q
+    E = (B-A) % q
+    F = (D-C) % q
+    G = (D+C) % q
+    H = (B+A) % q
+    X3 = (E*F) % q
+    Y3 = (G*H) % q
+    Z3 = (F*G) % q
+    T3 = (E*H) % q
+    return (X3, Y3, Z3, T3)
+
+def xpt_neg(pt):
+    (X, Y, Z, T) = pt
+    return ((-X) % q, Y, Z, (-T) % q)
+
+def xpt_multi(pts, ns):
+    """Return sum([n]pt) for all extended points pts and scalars ns"""
+    acc = pt_xform((0,1))
+    for i in reversed(range(max(ns).bit_length())):
+        acc = xpt_double(acc)
+        for pt, n in zip(pts, ns):
+            if (n >> i) & 1:
+                acc = xpt_add_unified(acc, pt)
+    return acc
+
+def checkvalid_batch(ss, ms, pks, zs):
+    """Returns True iff (with overwhelming probability) every signature s in ss is a valid signature
+    on its message m by pk, using the corresponding random nonzero scalars zs.  Raises an Exception
+    for any undecodable or non-canonical R, A or S."""
+    Bn = 0
+    pts = [pt_xform(B)]
+    ns = [Bn]
+    for s, m, pk, z in zip(ss, ms, pks, zs):
+        if len(s) != b//4: raise Exception("signature length is wrong")
+        if len(pk) != b//8: raise Exception("public-key length is wrong")
+        R = decodepoint(s[0:b//8])
+        A = decodepoint_vk(pk)
+        S = decodeint(s[b//8:b//4])
+        # Reject non-canonical encodings; the batch must not accept what checkvalid would not
+        if S >= l: raise Exception("signature S is not reduced")
+        if encodepoint(R) != s[0:b//8] or encodepoint(A) != pk:
+            raise Exception("non-canonical point encoding")
+        h = Hint(s[0:b//8] + pk + m)
+        Bn += z * S
+        pts.extend((xpt_neg(pt_xform(R)), xpt_neg(pt_xform(A))))
+        ns.extend((z % l, (z * h) % l))
+    ns[0] = Bn % l
+    (X, Y, Z, _) = xpt_double(xpt_double(xpt_double(xpt_multi(pts, ns))))
+    return X == 0 and Y == Z
+
 ##########################################################
 #
 # Curve25519 reference implementation by Matthew Dempsky, from:
@@ -28,9 +28,12 @@ import logging
 
 from enum		import Enum
 
-import requests
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:					# Python2 w/o the futures backport
+    ThreadPoolExecutor		= None
 
-from ...misc		import type_str_base, memoize, log_cfg, log_level
+from ...misc		import type_str_base, memoize, timer, log_cfg, log_level
 from ..defaults		import DOHMAXSIZE, DOHMAXAGE
 
 log				= logging.getLogger( "DoH" )
@@ -95,8 +98,11 @@ class DoH_Provider( Enum ):
     CLOUDFLARE	= 1
 
 
-@memoize( maxsize=DOHMAXSIZE, maxage=DOHMAXAGE, log_at=logging.DEBUG )
-def query_cached( domain, record_type, provider=None, timeout=5 ):
+def query_fetch( domain, record_type, provider=None, timeout=5 ):
+    """Returns the (expires, answer) of the DNS record query.  Each answer expires by its least record
+    TTL.  Not memoized, so is safe to call from any thread.
+
+    """
     if provider in ( None, DoH_Provider.GOOGLE ):
         #url			= 'https://dns.google/resolve'
         url			= 'https://8.8.8.8/resolve'
@@ -119,6 +125,7 @@ def query_cached( domain, record_type, provider=None, timeout=5 ):
         do	= 'true',			# Include DNSSEC
     )
 
+    import requests					# deferred; only needed on a cache miss
     response			= requests.get(
         url,
         params	= params,
@@ -135,7 +142,41 @@ def query_cached( domain, record_type, provider=None, timeout=5 ):
         raise DoHError( "Invalid DNS-over-HTTPS response from {}; missing {}{}".format(
             response.url, record_type.name, json.dumps( payload, indent=4 ) if log.isEnabledFor( logging.DEBUG ) else '' ))
 
-    return payload['Answer']
+    expires			= timer() + min(
+        [ DOHMAXAGE ] + [ a['TTL'] for a in payload['Answer'] if 'TTL' in a ] )
+    return expires, payload['Answer']
+
+
+@memoize( maxsize=DOHMAXSIZE, maxage=DOHMAXAGE, log_at=logging.DEBUG )
+def query_cached( domain, record_type, provider=None, timeout=5, fetched=None ):
+    """Returns the (expires, answer) of the DNS record query, memoized.  The memoize maxage is
+    measured from the last use, so would keep a popular answer indefinitely; see query_expired.
+
+    A previously fetched (expires, answer) is memoized as-is, instead of querying.  Since memoize is
+    not thread-safe, this is how prefetch fills the memo from its calling thread.
+
+    """
+    if fetched is not None:
+        return fetched
+    return query_fetch( domain, record_type, provider=provider, timeout=timeout )
+
+
+def query_expired( domain, record_type, now=None ):
+    """Discard any memoized query_cached answer that has outlived its TTL.  Returns True iff no
+    unexpired answer remains.  The expiry is memoized w/ the answer, so is ejected along with it.
+
+    """
+    key				= domain, record_type
+    with query_cached._lock:
+        entry			= query_cached._memo.get( key )
+        if entry is None:
+            return True
+        expires,_		= entry
+        if expires >= ( timer() if now is None else now ):
+            return False
+        query_cached._memo.pop( key, None )
+        query_cached._stat.pop( key, None )
+    return True
 
 
 def query( domain, record=None, provider=None, timeout=5.0 ):
@@ -144,7 +185,7 @@ def query( domain, record=None, provider=None, timeout=5.0 ):
     We assume that the domain is already properly encoded, ie. transformed from UTF-8 to punycode.
 
     Transform the record into a DNSRecord Enum; the first 2 args of query_cached are memoized, so
-    ensure they are of the expected type.
+    ensure they are of the expected type.  Memoized answers are re-queried once their TTL expires.
 
     """
     try:
@@ -158,4 +199,43 @@ def query( domain, record=None, provider=None, timeout=5.0 ):
     except Exception as exc:
         raise_from( DoHError( "Invalid DNS-over-HTTPS record {!r}".format( record )), exc )
 
-    return query_cached( domain, record_type, provider=provider, timeout=timeout )
+    query_expired( domain, record_type )
+    _,answer			= query_cached( domain, record_type, provider=provider, timeout=timeout )
+    return answer
+
+
+def prefetch( domains, record=None, provider=None, timeout=5.0, workers=8 ):
+    """Concurrently query any of the domains' records not already memoized, so that subsequent
+    query calls for them are answered from the cache.  Each DoH query is almost entirely network
+    latency, so N independent queries take about as long as one.
+
+    Only the network fetches are done in the worker Threads; the answers are memoized from the
+    calling Thread.  Any failures are ignored here; they are not memoized, so will be raised by the
+    subsequent query.  Does nothing if concurrent.futures is unavailable.
+
+    """
+    if ThreadPoolExecutor is None:
+        return
+    record_type			= DNSRecord[record] if isinstance( record, type_str_base ) else record
+    now				= timer()
+    pending			= [
+        domain
+        for domain in set( domains )
+        if query_expired( domain, record_type, now=now )
+    ]
+    if len( pending ) < 2:
+        return
+
+    def attempt( domain ):
+        try:
+            return query_fetch( domain, record_type, provider=provider, timeout=timeout )
+        except Exception as exc:
+            log.debug( "Prefetch of {} {} failed: {}".format( domain, record_type.name, exc ))
+
+    pool			= ThreadPoolExecutor( max_workers=min( workers, len( pending )))
+    try:
+        for domain,fetched in zip( pending, pool.map( attempt, pending )):
+            if fetched is not None and query_expired( domain, record_type ):
+                query_cached( domain, record_type, fetched=fetched )
+    finally:
+        pool.shutdown()
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import json
+import threading
 
 from ..misc import urlopen, urlencode, Request
 from . import doh
@@ -78,3 +79,79 @@ def test_doh_api():
         == "v=DKIM1; k=rsa; p=MIIBIjANBgkqhkiG9w0BAQEFAAOCAQ8AMIIBCgKCAQEA0PMv4yXqvYlPWxCt7ZjdfR9Q4GzkGhxIEqxFTQEsPF0GxpZPr54GTiMsvmWxsrJWCb9OFo5qx48lPnHu1Y/KZcx6"\
         "xydZiNxYdGedcRZFtMAwQAKQgo2Iq28PamZf5D8BO1+rg9tlAo2vYKrp6Cf1zTxDqHzSVl85RA7PZj1Jb/7jpqujT1SRXngrerB4iYBtx" \
         "aPXTN/aI+cvS8kREW7tYkb4nt2fK3sb2RtCe5hxGTOdtIie/stZj/w/5ozsrtEZ6CiGQA38IaVOFsGwAvmhucy08UzbycmXKYsJiWPpSyXBXSX+O+5WaqgOYvcGT9CHBBWoFJG37Qf4KHoQqhS7IwIDAQAB;"
+
+
+def test_doh_ttl( monkeypatch ):
+    """Memoized answers are re-queried after their TTL expires."""
+    queries			= []
+
+    class Response( object ):
+        status_code		= 200
+        url			= 'https://8.8.8.8/resolve'
+
+        def json( self ):
+            return dict( Answer=[ dict( name='ttl.example.com.', type=16, TTL=60, data="v=DKIM1" ) ] )
+
+    def get( url, **kwds ):
+        queries.append( url )
+        return Response()
+
+    now				= [ 1000.0 ]
+    monkeypatch.setattr( requests, 'get', get )
+    monkeypatch.setattr( doh, 'timer', lambda: now[0] )
+
+    assert doh.query( 'ttl.example.com', 'TXT' )[0]['data'] == "v=DKIM1"
+    now[0]		       += 59
+    assert doh.query( 'ttl.example.com', 'TXT' )[0]['data'] == "v=DKIM1"
+    assert len( queries ) == 1
+    now[0]		       += 2
+    assert doh.query( 'ttl.example.com', 'TXT' )[0]['data'] == "v=DKIM1"
+    assert len( queries ) == 2
+
+
+def test_doh_prefetch( monkeypatch ):
+    """Prefetched answers are memoized, so subsequent queries need not wait on the network.  The
+    memo is only ever filled from the calling Thread."""
+    names			= []
+    threads			= set()
+    memoized			= doh.query_cached
+
+    def query_cached( *args, **kwds ):
+        threads.add( threading.current_thread() )
+        return memoized( *args, **kwds )
+    query_cached._memo		= memoized._memo
+    query_cached._stat		= memoized._stat
+    query_cached._lock		= memoized._lock
+
+    class Response( object ):
+        status_code		= 200
+        url			= 'https://8.8.8.8/resolve'
+
+        def __init__( self, name ):
+            self.name		= name
+
+        def json( self ):
+            return dict( Answer=[ dict( name=self.name, type=16, TTL=60, data=self.name ) ] )
+
+    def get( url, params=None, **kwds ):
+        names.append( params['name'] )
+        return Response( params['name'] )
+
+    monkeypatch.setattr( requests, 'get', get )
+    monkeypatch.setattr( doh, 'query_cached', query_cached )
+
+    domains			= [ "{}.prefetch.example.com".format( n ) for n in 'abc' ]
+    doh.prefetch( domains + domains[:1], 'TXT' )
+    assert sorted( names ) == domains
+    for domain in domains:
+        assert doh.query( domain, 'TXT' )[0]['data'] == domain
+    assert len( names ) == 3
+
+    # An answer ejected from the memo (eg. when it exceeds DOHMAXSIZE) takes its expiry with it
+    key				= domains[0], doh.DNSRecord.TXT
+    del doh.query_cached._memo[key]
+    del doh.query_cached._stat[key]
+    another			= "d.prefetch.example.com"
+    doh.prefetch( domains + [ another ], 'TXT' )
+    assert sorted( names[3:] ) == [ domains[0], another ]
+    assert threads == set([ threading.current_thread() ])
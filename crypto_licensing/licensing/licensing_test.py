@@ -6,21 +6,24 @@ try:
 except ImportError:
     pass
 
+import base64
 import json
 import logging
 import multiprocessing
 import os
 import sys
+import threading
 import pytest
 
-from ..misc		import reprlib, urlopen
+from ..misc		import reprlib, httplib, memoize, parse_qsl, pathlib
 from ..			import licensing
 
 # If web.py or cpppo is unavailable, licensing.main cannot be used
 try:
-    from .main import main as licensing_main
+    from .main import main as licensing_main, BatchVerifier
 except ImportError:
     licensing_main		= None
+    BatchVerifier		= None
 
 try:
     import web
@@ -34,10 +37,21 @@ try:
     import chacha20poly1305
 except ImportError:
     chacha20poly1305		= None
+try:
+    from orjson import loads as json_loads  	# optional; faster JSON response decoding
+except ImportError:
+    json_loads			= json.loads
 
 
 log				= logging.getLogger( "lic.svr")
 
+# Where available, fork the bench server and Manager processes, so they inherit our already imported
+# modules, keys, etc. instead of re-importing everything (eg. w/ the macOS 'spawn' default)
+try:
+    mp_context			= multiprocessing.get_context( 'fork' )
+except (AttributeError, ValueError):  # Python2 (always forks), or no fork (eg. Windows)
+    mp_context			= multiprocessing
+
 client_count			= 25
 client_max			= 10
 
@@ -51,7 +65,15 @@ licensing_cli_kwds		= {
     ],
 }
 
-CFGPATH				=  __file__[:-3]  # trim off .py
+HERE				= pathlib.Path( __file__ )
+CFGPATH				= str( HERE.with_suffix( '' ))  # trim off .py
+MACHINE_ID_PATH			= HERE.with_suffix( '.machine-id' )
+
+# This test's constant Machine ID; derived once, not on every query signed
+enduser_machine			= licensing.machine_UUIDv4( machine_id_bytes=MACHINE_ID_PATH.read_bytes() )
+
+# The End User, LLC client's signing key; decoded once, not on every query signed
+enduser_sigkey			= base64.b64decode( "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA7aie8zrakLWKjqNAqbw1zZTIVdx3iQ6Y6wEihi1naKQ==" )
 
 
 def test_generators():
@@ -83,7 +105,7 @@ def test_generators():
     assert list( gen_catches() ) == [0]
 
 
-def licensing_issue_query():
+def licensing_issue_request():
     # Issue a license to this machine-id, for client "End User, LLC".
 
     # TODO: XXX: These requests are signed, proving that they came from the holder of the client
@@ -92,16 +114,40 @@ def licensing_issue_query():
     #
     # This is only possible if the channel can be examined; public License Servers should be served
     # over SSL protected channels.
-    request			= licensing.IssueRequest(
+    return licensing.IssueRequest(
         client		= "End User, LLC",
         client_pubkey	= "O2onvM62pC1io6jQKm8Nc2UyFXcd4kOmOsBIoYtZ2ik=",
         author		= "Awesome, Inc.",
         author_pubkey	= "cyHOei+4c5X+D/niQWvDG5olR1qi4jddcPTDJv/UfrQ=",
         product		= "EtherNet/IP Tool",
-        machine		= licensing.machine_UUIDv4( machine_id_path=__file__.replace( ".py", ".machine-id" )),
+        machine		= enduser_machine,
     )
-    query			= request.query( sigkey="AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA7aie8zrakLWKjqNAqbw1zZTIVdx3iQ6Y6wEihi1naKQ==" )
+
+
+@memoize()
+def licensing_issue_query():
+    """The signed issue request query.  The inputs are constant, so every client (thread) shares the
+    one Ed25519-signed query, instead of re-signing it; it is checked once, by test_licensing_issue_query.
+
+    """
+    return licensing_issue_request().query( sigkey=enduser_sigkey )
+
+
+def test_licensing_issue_query():
+    """The IssueRequest query wire format.  Ed25519 signatures are deterministic (RFC 8032), so the
+    signature is fixed for a given signing key and payload, regardless of the Ed25519 implementation.
+
+    """
+    query			= licensing_issue_query()
     #print( query )
+
+    # Confirm the query round-trips, and that its signature is verified by the client's public key.
+    qd				= dict( parse_qsl( query ))
+    signature			= qd.pop( 'signature' )
+    received			= licensing.IssueRequest( **qd )
+    assert received == licensing_issue_request()
+    received.verify( pubkey=qd['client_pubkey'], signature=signature )
+
     assert """\
 author=Awesome%2C+Inc.&\
 author_pubkey=cyHOei%2B4c5X%2BD%2FniQWvDG5olR1qi4jddcPTDJv%2FUfrQ%3D&\
@@ -111,88 +157,170 @@ machine=00010203-0405-4607-8809-0a0b0c0d0e0f&\
 product=EtherNet%2FIP+Tool&\
 signature=kDCDoWJ2xDcIg5HicihQeJBxbo8LK%2BDCI2FPogQD2q4Slxylyq7G5xuEaV%2BWa6STD7GvGUSNGcGWPqazy1xDCQ%3D%3D\
 """ == query
-    return query
+
+
+@pytest.mark.skipif(
+    not BatchVerifier,
+    reason="Licensing server needs web.py"
+)
+def test_licensing_batch_verifier( monkeypatch ):
+    """Concurrent Threads' signatures are verified together in one batch; each Thread gets its own
+    payload, and a bad signature fails only its own request."""
+    batches			= []
+    open_batch			= licensing.ed25519.crypto_sign_open_batch
+
+    def open_batch_spy( signeds, vks ):
+        batches.append( len( signeds ))
+        return open_batch( signeds, vks )
+    monkeypatch.setattr( licensing.ed25519, 'crypto_sign_open_batch', open_batch_spy )
+
+    verifier			= BatchVerifier( size=4, delay=5.0 )
+    pubkey			= "O2onvM62pC1io6jQKm8Nc2UyFXcd4kOmOsBIoYtZ2ik="
+    requests			= []
+    for n in range( 4 ):
+        request			= licensing_issue_request()
+        request.client		= "End User {}, LLC".format( n )
+        requests.append( request )
+    assert len( set( request.serialize() for request in requests )) == 4
+    signatures			= [ request.sign( sigkey=enduser_sigkey ) for request in requests ]
+    signatures[2]		= signatures[1]			# Request 2 bears request 1's signature
+
+    results			= {}
+
+    def verify( n ):
+        try:
+            results[n]		= verifier.verify( requests[n], pubkey, signatures[n] )
+        except Exception as exc:
+            results[n]		= exc
+
+    threads			= [ threading.Thread( target=verify, args=(n,) ) for n in range( 4 ) ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert batches == [ 4 ]
+
+    with pytest.raises( AssertionError ) as exc_info:
+        verifier.verify( requests[0], pubkey, b'' )
+    assert str( exc_info.value ) == "Missing required signature"
+    for n,request in enumerate( requests ):
+        if n == 2:
+            assert isinstance( results[n], Exception )
+        else:
+            assert results[n] == request.serialize()
 
 
 def licensing_cli( number, tests=None, address=None ):
-    """Makes a series of HTTP requests to the licensing server, testing the response.
+    """Makes a series of HTTP requests to the licensing server, testing the response.  A single
+    keep-alive HTTP/1.1 connection is used for all requests, so we don't pay for a TCP connection
+    setup/teardown on every request, in both the client and server.
+
+    NOTE: This module must remain importable under Python2 (eg. by --doctest-modules), so an
+    asyncio/aiohttp client (requiring 'async def' syntax) cannot be used here; network.bench runs
+    these synchronous clients in a ThreadPool, and the socket I/O releases the GIL.
 
     """
     log.info( "Client number={}; starting".format( number ))
-    query			= licensing_issue_query()
-    url				= "http://{host}:{port}/api/issue.json?{query}&number={number}".format(
-        host	= address[0] if address else "localhost",
-        port	= address[1] if address else 8000,
-        query	= query,
-        number	= number,
+    # The (memoized) query is pre-URL-encoded; only the client number varies.  This is done once per
+    # client; the path must be a str, as (Python3) http.client rejects bytes request paths.
+    path			= "/api/issue.json?" + licensing_issue_query() + "&number=" + str( number )
+    conn			= httplib.HTTPConnection(
+        address[0] if address else "localhost",
+        address[1] if address else 8000,
+        timeout	= 30,
     )
-    log.detail( "Client number={}; url: {}".format( number, reprlib.repr( url )))
-    response			= urlopen( url ).read().decode( 'UTF-8' )
-    assert response
-    log.detail( "Client number={}; response: {}".format( number, reprlib.repr( response )))
-    data			= json.loads( response )
-    #print( data )
-    assert data['list'] and data['list'][0]['signature'] == 'pN3libfAJ/OUV2vDr0bqC36WGEiB2k5SVZ9djN8MKaoGlEcM5IKS0Lxjuy2TFp9dgFtot/ku1hy9wOnpOC8DCw=='
+    try:
+        for test in tests or [ None ]:
+            if log.isEnabledFor( logging.DETAIL ):
+                log.detail( "Client number={}; test: {!r}, path: {}".format( number, test, reprlib.repr( path )))
+            conn.request( "GET", path )
+            response		= conn.getresponse().read()		# UTF-8 bytes; both JSON decoders accept
+            assert response
+            if log.isEnabledFor( logging.DETAIL ):
+                log.detail( "Client number={}; response: {}".format( number, reprlib.repr( response )))
+            data		= json_loads( response )
+            #print( data )
+            assert data['list'] and data['list'][0]['signature'] == 'pN3libfAJ/OUV2vDr0bqC36WGEiB2k5SVZ9djN8MKaoGlEcM5IKS0Lxjuy2TFp9dgFtot/ku1hy9wOnpOC8DCw=='
+    finally:
+        conn.close()
     log.info( "Client number={}; done".format( number ))
 
 
-def licensing_bench():
-    with multiprocessing.Manager() as m:
-
-        licensing_svr_kwds		= dict(
-            # We've got an end-user Keypair encrypted w/ these credentials available in our CFGPATH,
-            # and a matching Crypto Licensing Server License issued to this End User Agent ID's
-            # pubkey.
-            argv	= [
-                #"-v",
-                "--no-gui",
-                "--config", CFGPATH,
-                "--web", "127.0.0.1:0",
-                "--username", "a@b.c",
-                "--password", "password",
-                #"--log", "/tmp/crypto-licensing-server.log",
-                #"--no-access",		# Do not redirect sys.stdout/stderr to an access log file
-                #"--profile", "licensing.prof", # Optionally, enable profiling (pip install ed25519ll helps...)
-            ],
-
-            # The master server control dict; 'control' may be converted to a different form (eg. a
-            # multiprocessing.Manager().dict()) if necessary.  Each of the Licensing server thread-specific
-            # configs will be provided a reference to this control (unless, for some reason, you don't want
-            # them to share it).  If *any* thread shuts down, they will all be stopped.
-            server	= dict(
-                control		= m.apidict(
-                    1.0,  # apidict timeout
-                    done	= False
-                ),
-            ),
-
-            # The licensing control system loop.  This runs various licensing state machinery
-            ctl		= dict(
-                cycle		= 1.0,
-            ),
+@pytest.fixture( scope="session" )
+def mp_manager():
+    """A multiprocessing.Manager, shared by all tests in the session; avoids starting a Manager
+    server process for each benchmark run.
 
-            # The Web API.  Remote web API access and web page.
-            web		= dict(
-                #access		= False,	# Do not redirect sys.stdout/stderr to an access log file
-                #address	= "127.0.0.1:0",# Use a dynamic bind port for testing the server (force ipv4 localhost)
+    """
+    m				= mp_context.Manager()
+    yield m
+    m.shutdown()
+
+
+def licensing_bench( m ):
+    licensing_svr_kwds		= dict(
+        # We've got an end-user Keypair encrypted w/ these credentials available in our CFGPATH,
+        # and a matching Crypto Licensing Server License issued to this End User Agent ID's
+        # pubkey.
+        argv	= [
+            #"-v",
+            "--no-gui",
+            "--config", CFGPATH,
+            "--web", "127.0.0.1:0",
+            "--batch",		# Verify concurrent issue requests' signatures in batches, if supported
+            "--username", "a@b.c",
+            "--password", "password",
+            #"--log", "/tmp/crypto-licensing-server.log",
+            #"--no-access",		# Do not redirect sys.stdout/stderr to an access log file
+            #"--profile", "licensing.prof", # Optionally, enable profiling (pip install ed25519ll helps...)
+        ],
+
+        # The master server control dict; 'control' may be converted to a different form (eg. a
+        # multiprocessing.Manager().dict()) if necessary.  Each of the Licensing server thread-specific
+        # configs will be provided a reference to this control (unless, for some reason, you don't want
+        # them to share it).  If *any* thread shuts down, they will all be stopped.  This must remain
+        # a dict-like (not eg. a multiprocessing.Event), as network.bench both harvests the server's
+        # bound 'address' from it, and signals 'done' through it.  Within the server, 'done' is only
+        # polled once per ctl cycle (1.0s, below), so the Manager proxy round-trip isn't significant.
+        server	= dict(
+            control		= m.apidict(
+                1.0,  # apidict timeout
+                done	= False
             ),
+        ),
+
+        # The licensing control system loop.  This runs various licensing state machinery
+        ctl		= dict(
+            cycle		= 1.0,
+        ),
+
+        # The Web API.  Remote web API access and web page.
+        web		= dict(
+            #access		= False,	# Do not redirect sys.stdout/stderr to an access log file
+            #address	= "127.0.0.1:0",# Use a dynamic bind port for testing the server (force ipv4 localhost)
+        ),
+
+        # The Text GUI.  Controls the internals of the Licensing server from the server text console
+        txt		= dict(
+            title		= "Licensing",
+        ),
+    )
 
-            # The Text GUI.  Controls the internals of the Licensing server from the server text console
-            txt		= dict(
-                title		= "Licensing",
-            ),
-        )
-
-        # Start up the Web interface on a dynamic port, eg. "localhost:0"
-        failed			= network.bench(
-            server_func	= licensing_main,
-            server_kwds	= licensing_svr_kwds,
-            client_func	= licensing_cli,
-            client_count= client_count,
-            client_max	= client_max,
-            client_kwds	= licensing_cli_kwds,
-            address_delay= 5.0,
-        )
+    # Start up the Web interface on a dynamic port, eg. "localhost:0".  The server runs in a
+    # multiprocessing.Process (hence the Manager apidict control, above), but the clients are I/O
+    # bound HTTP requests, and network.bench already runs them in a (client_max) ThreadPool; no
+    # Python interpreters are forked to run them.
+    failed			= network.bench(
+        server_func	= licensing_main,
+        server_kwds	= licensing_svr_kwds,
+        client_func	= licensing_cli,
+        client_count= client_count,
+        client_max	= client_max,
+        client_kwds	= licensing_cli_kwds,
+        address_delay= 5.0,
+        server_cls	= mp_context.Process,
+    )
 
     if failed:
         log.warning( "Failure" )
@@ -210,8 +338,8 @@ def licensing_bench():
     or sys.platform == "darwin" and sys.version_info[0] >= 3,  # _pickle.PicklingError: Can't pickle <class 'multiprocessing.managers.apidict_proxy'>:
     reason="Licensing server needs web.py, chacha20poly1305, cpppo"
 )
-def test_licensing_bench( tmp_path ):
+def test_licensing_bench( tmp_path, mp_manager ):
     print( "Changing CWD to {}".format( tmp_path ))
     os.chdir( str( tmp_path ))
-    assert not licensing_bench(), \
+    assert not licensing_bench( mp_manager ), \
         "One or more licensing_bench clients reported failure"
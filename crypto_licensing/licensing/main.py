@@ -913,6 +913,87 @@ def keypairs_request( render, path, environ, accept, framework,
     return content, response
 
 
+class BatchVerifier( object ):
+    """Verifies the Ed25519 signatures of Serializable objects (eg. IssueRequests) arriving from
+    concurrent web request Threads in batches, using ed25519.crypto_sign_open_batch.
+
+    The first Thread to arrive leads the next batch; it waits up to 'delay' seconds for up to 'size'
+    requests to accumulate (from other Threads), verifies them all, and then wakes the Threads
+    waiting on the outcome.  If the batch fails, each is verified individually, so only the invalid
+    signature(s) are rejected.
+
+    Only worthwhile if the Ed25519 implementation has a true batch verification (ed25519.BATCHED);
+    otherwise, each request just waits for the batch w/ no gain.  A batch uses the cofactored
+    verification equation, so it may accept a (maliciously constructed) signature w/ a small-order
+    component that individual verification would reject; see ed25519ll_pyonly.
+
+    """
+    def __init__( self, size=16, delay=.005 ):
+        self.size		= size
+        self.delay		= delay
+        self.cond		= threading.Condition()
+        self.pending		= []
+        self.leading		= False
+
+    def verify( self, serializable, pubkey, signature ):
+        """Verify the serializable's signature (w/ the same semantics as Serializable.verify), returning
+        the verified payload bytes or raising an Exception."""
+        pubkey, _		= licensing.into_keys( pubkey )
+        signature		= licensing.into_bytes( signature, ('base64',) )
+        assert pubkey and signature, \
+            "Missing required {}".format(
+                ', '.join( ( () if pubkey else ('public key',) )
+                           + ( () if signature else ('signature',) )))
+        entry			= dict( signed=signature + serializable.serialize(), vk=pubkey )
+        with self.cond:
+            self.pending.append( entry )
+            self.cond.notify_all()
+            while 'payload' not in entry and 'error' not in entry:
+                if self.leading:
+                    self.cond.wait()
+                    continue
+                self.lead()
+        if 'error' in entry:
+            raise entry['error']
+        return entry['payload']
+
+    def lead( self ):
+        """With self.cond held, collect and verify the next batch of pending entries."""
+        self.leading		= True
+        try:
+            deadline		= timer() + self.delay
+            while len( self.pending ) < self.size:
+                remains		= deadline - timer()
+                if remains <= 0:
+                    break
+                self.cond.wait( remains )
+            batch		= self.pending[:self.size]
+            self.pending	= self.pending[self.size:]
+            self.cond.release()
+            try:
+                try:
+                    payloads	= licensing.ed25519.crypto_sign_open_batch(
+                        [ e['signed'] for e in batch ], [ e['vk'] for e in batch ] )
+                    for e,payload in zip( batch, payloads ):
+                        e['payload'] = payload
+                except Exception:
+                    # Some signature(s) failed; find out which
+                    for e in batch:
+                        try:
+                            e['payload'] = licensing.ed25519.crypto_sign_open( e['signed'], e['vk'] )
+                        except Exception as exc:
+                            e['error'] = exc
+                log.info( "Batch verified {} signatures".format( len( batch )))
+            finally:
+                self.cond.acquire()
+        finally:
+            self.leading	= False
+            self.cond.notify_all()
+
+
+issue_batch			= None		# A BatchVerifier, if --batch
+
+
 def issue_request( render, path, environ, accept, framework,
                     queries=None, posted=None, logged=None, proxy=None ):
     """Returns a License issuance response, as HTML or JSON.
@@ -972,7 +1053,10 @@ def issue_request( render, path, environ, accept, framework,
     log.info( "Issue request number={number}; {req}, w/ signature: {sig!r}".format(
         number=number, req=str( issue_request ), sig=signature ))
     try:
-        issue_request.verify( pubkey=client_pubkey, signature=signature )
+        if issue_batch:
+            issue_batch.verify( issue_request, pubkey=client_pubkey, signature=signature )
+        else:
+            issue_request.verify( pubkey=client_pubkey, signature=signature )
     except Exception as exc:
         raise http_exception( framework, 401, "Ed25519 Signature of request is incorrect: {exc}".format(
             exc=exc ))
@@ -1741,9 +1825,9 @@ Issues license(s) for products and capabilities available to the client, where e
 
 Produces invoices for each transaction
 
-Performance benefits greatly from installation of (optional) ed25519ll package:
+Performance benefits greatly from installation of (optional) PyNaCl (libsodium) package:
 
-    python3 -m pip install ed25519ll
+    python3 -m pip install crypto-licensing[nacl]
 """
     )
     ap.add_argument( '-v', '--verbose', action="count",
@@ -1789,6 +1873,9 @@ Performance benefits greatly from installation of (optional) ed25519ll package:
                      default=licensing.PRODUCT_SERVER,
                      help="This {DISTRIBUTION} server's client licensee's product name (if any; default: {PRODUCT})".format(
                          DISTRIBUTION=licensing.DISTRIBUTION, PRODUCT=licensing.PRODUCT_SERVER ))
+    ap.add_argument( '--batch', action='store_true',
+                     default=False,
+                     help="Verify concurrent issue request signatures in Ed25519 batches" )
     ap.add_argument( '-U', '--username',
                      default=None,
                      help="{DISTRIBUTION} Agent credentials username; likely an email address ('-' to read from input)".format(
@@ -2003,6 +2090,14 @@ Performance benefits greatly from installation of (optional) ed25519ll package:
     # Set up the global db, etc.
     db_setup()
 
+    if args.batch:
+        if licensing.ed25519.BATCHED:
+            global issue_batch
+            issue_batch		= BatchVerifier()
+        else:
+            log.warning( "Ignoring --batch; the Ed25519 implementation {} has no batch verification".format(
+                licensing.ed25519.crypto_sign_open.__module__ ))
+
     # Summarize the initial Licenses and Keypairs available; these are re-obtained in real-time by the UIs, above
     stored			= db.select( 'licenses' )
     stored			= list( stored )
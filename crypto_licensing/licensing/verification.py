@@ -19,6 +19,8 @@
 from __future__ import absolute_import, print_function, division
 from future.utils import raise_from
 
+import base64
+import binascii
 import codecs
 import copy
 import datetime
@@ -34,29 +36,44 @@ import uuid
 from functools		import wraps
 from enum		import Enum
 
-import dns.name
-
 from . 			import doh
 from .defaults		import (
     DISTRIBUTION, LICPATTERN, LICEXTENSION, KEYPATTERN, KEYEXTENSION,
 )
 from ..misc		import (
-    type_str_base, type_num_base, urlencode,
+    type_str_base, type_num_base, quote_plus,
     parse_datetime, parse_seconds, Timestamp, Duration,
-    config_open_deduced,
+    config_open_deduced, memoize,
     token_bytes, is_mapping, is_listlike,
 )
 
-# Get Ed25519 support. Try a globally installed ed25519ll possibly with a CTypes binding, Otherwise,
-# try our local Python-only ed25519ll derivation, or fall back to the very slow D.J.Bernstein Python
-# reference implementation
+# Get Ed25519 support. Try PyNaCl (libsodium), then a globally installed ed25519ll possibly with a
+# CTypes binding.  Otherwise, try our local Python-only ed25519ll derivation, or fall back to the very
+# slow D.J.Bernstein Python reference implementation
 from .. import ed25519
 
-# Optionally, we can provide ChaCha20Poly1305 to support KeypairEncrypted
+# Optionally, we can provide ChaCha20Poly1305 to support KeypairEncrypted.  Prefer the (much faster)
+# OpenSSL implementation from cryptography, over the pure-Python chacha20poly1305.  Both implement
+# RFC 8439 (ciphertext w/ appended 128-bit tag), and so produce identical ciphertexts.
 try:
-    from chacha20poly1305 import ChaCha20Poly1305
+    from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
 except ImportError:
-    pass
+    try:
+        from chacha20poly1305 import ChaCha20Poly1305
+    except ImportError:
+        pass
+
+# Optionally, support BLAKE3 digests
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3			= None
+
+# Optionally, use orjson to produce the compact (sort_keys) JSON serializations faster
+try:
+    import orjson
+except ImportError:
+    orjson			= None
 
 __author__                      = "Perry Kundert"
 __email__                       = "perry@dominionrnd.com"
@@ -187,11 +204,20 @@ def into_text( binary, decoding='hex', encoding='ASCII' ):
             binary		= bytes( binary )
         assert isinstance( binary, bytes ), \
             "Cannot convert to {}: {!r}".format( decoding, binary )
-        binary			= codecs.getencoder( decoding )( binary )[0]
-        binary			= binary.replace( b'\n', b'' )  # some decodings contain line-breaks
+        encoder			= into_text.encoders.get( decoding )
+        if encoder:
+            binary		= encoder( binary )
+        else:
+            binary		= codecs.getencoder( decoding )( binary )[0]
+            binary		= binary.replace( b'\n', b'' )  # some decodings contain line-breaks
         if encoding is not None:
             return binary.decode( encoding )
         return binary
+# The common hex and base64 encodings, directly (w/o codec lookup, or line-breaks to remove)
+into_text.encoders		= dict(  # noqa: E305
+    hex		= binascii.hexlify,
+    base64	= base64.b64encode,
+)
 
 
 def into_bytes( text, decodings=('hex', 'base64'), ignore_invalid=None ):
@@ -255,10 +281,12 @@ def into_keys( keypair, verify=False ):
         return keypair.vk, keypair.sk
     except AttributeError:
         pass
-    # Not a Keypair.  First, see if it's a serialized public/private key.
-    deserialized		= into_bytes( keypair, ('base64',), ignore_invalid=True )
-    if deserialized:
-        keypair			= deserialized
+    # Not a Keypair.  First, see if it's a serialized public/private key.  Raw (Python3) bytes key
+    # material is used as-is; callers that sign repeatedly can decode their key once, up front.
+    if not ( isinstance( keypair, bytes ) and not isinstance( keypair, type_str_base )):
+        deserialized		= into_bytes( keypair, ('base64',), ignore_invalid=True )
+        if deserialized:
+            keypair		= deserialized
     # Finally, see if we've recovered a signing or public key
     if isinstance( keypair, bytes ):
         if len( keypair ) == 64:
@@ -302,18 +330,78 @@ def into_JSON( thing, indent=None, default=None, prefix=None ):
                 return default( x )
             log.warning("Failed to JSON serialize {!r}: {}".format( x, exc ))
             raise exc
-    # Unfortunately, Python2 json.dumps w/ indent emits trailing whitespace after "," making
-    # tests fail.  Make the JSON separators whitespace-free, so the only difference between the
-    # signed serialization and an pretty-printed indented serialization is the presence of
-    # whitespace.
-    separators			= (',', ':')
-    text			= json.dumps(
-        thing, sort_keys=True, indent=indent, separators=separators, default=endict )
+
+    def exact( x ):
+        """Confirm that orjson will serialize x exactly as json.dumps would, returning x.  orjson
+        serializes an Enum or UUID natively; json.dumps uses the default.  It renders some floats
+        differently (eg. exponents w/o a '+', NaN/Infinity as null).  Any other non-JSON objects are
+        passed thru to orjson's default (endict_exact)."""
+        if type( x ) is float:
+            if orjson.dumps( x ) != float.__repr__( x ).encode( 'ASCII' ):
+                raise TypeError( "Inexact JSON float {!r}".format( x ))
+        elif type( x ) is dict:
+            for key,val in x.items():
+                if type( key ) is not str:
+                    raise TypeError( "Inexact JSON key {!r}".format( key ))
+                exact( val )
+        elif type( x ) in ( list, tuple ):
+            for val in x:
+                exact( val )
+        elif isinstance( x, (Enum, uuid.UUID) ):
+            raise TypeError( "Inexact JSON value {!r}".format( x ))
+        return x
+
+    def endict_exact( x ):
+        """Serialize x for orjson, as json.dumps would.  It serializes subclasses of its native types
+        itself (eg. a namedtuple as a list, a float subclass as a float); use its serialization."""
+        if isinstance( x, (type_str_base, int, float, list, tuple, dict) ):
+            raise TypeError( "Inexact JSON subclass {!r}".format( x ))
+        try:
+            return exact( dict( x ))
+        except Exception:
+            if default:
+                return exact( default( x ))
+            raise
+
+    # If available, orjson produces the compact serialization faster.  This is the serialization
+    # that is signed and digested, so it must be identical to json.dumps'; it must never depend on
+    # what is installed.  orjson doesn't escape non-ASCII or DEL; if it produces either, use
+    # json.dumps' serialization instead.  Anything else orjson would serialize differently (some
+    # floats, datetimes, dataclasses, subclasses of JSON types, Enums, UUIDs) does the same.  The
+    # indented (human readable) serialization is always produced by json.dumps.
+    text			= None
+    if orjson and indent is None:
+        try:
+            text		= orjson.dumps( exact( thing ), default=endict_exact, option=(
+                orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS )).decode( 'ASCII' )
+        except Exception:
+            text		= None
+        else:
+            if '\x7f' in text:
+                text		= None
+    if text is None:
+        # Unfortunately, Python2 json.dumps w/ indent emits trailing whitespace after "," making
+        # tests fail.  Make the JSON separators whitespace-free, so the only difference between the
+        # signed serialization and an pretty-printed indented serialization is the presence of
+        # whitespace.
+        separators		= (',', ':')
+        text			= json.dumps(
+            thing, sort_keys=True, indent=indent, separators=separators, default=endict )
     if prefix and text:
         text			= '\n'.join( prefix + line for line in text.splitlines() )
     return text
 
 
+def into_JSON_compact( thing ):
+    """Convert thing to compact JSON, splicing in the compact serialization of any Serializable."""
+    if isinstance( thing, Serializable ):
+        return thing.compact()
+    if isinstance( thing, (list, tuple) ):
+        return '[' + ','.join( into_JSON_compact( item ) for item in thing ) + ']'
+    return into_JSON( thing )
+
+
 def into_boolean( val, truthy=(), falsey=() ):
     """Check if the provided numeric or str val content is truthy or falsey; additional tuples of
     truthy/falsey lowercase values may be provided.  The empty/whitespace string is Falsey."""
@@ -395,24 +483,45 @@ def into_UUIDv4( machine ):
     return machine
 
 
-def machine_UUIDv4( machine_id_path=None ):
+def machine_UUIDv4( machine_id_path=None, machine_id_bytes=None ):
     """Identify the machine-id as an RFC 4122 UUID v4. On Linux systems w/ systemd, get from
     /etc/machine-id, as a UUID v4: https://www.man7.org/linux/man-pages/man5/machine-id.5.html.
     On MacOS and Windows, use uuid.getnode(), which derives from host-specific data (eg. MAC
     addresses, serial number, ...).
 
+    If the machine-id file's contents are already available, supply them as machine_id_bytes, and
+    no file will be read.
+
     This UUID should be reasonably unique across hosts, but is not guaranteed to be.
 
+    The result is remembered for each machine-id file (until its modification time changes), or for
+    each supplied machine_id_bytes.
+
     TODO: Include root disk UUID?
     """
+    if machine_id_bytes is not None:
+        return machine_UUIDv4_memo( None, None, machine_id_bytes )
     if machine_id_path is None:
         machine_id_path		= "/etc/machine-id"
     try:
-        with open( machine_id_path, 'r' ) as m_id:
-            machine_id		= m_id.read().strip()
+        mtime			= os.stat( machine_id_path ).st_mtime
     except Exception:
-        # Node number is typically a much shorter integer; fill to required UUID length.
-        machine_id		= "{:0>32}".format( hex( uuid.getnode())[2:] )
+        mtime			= None
+    return machine_UUIDv4_memo( machine_id_path, mtime, None )
+
+
+@memoize( maxsize=8 )
+def machine_UUIDv4_memo( machine_id_path, mtime, machine_id_bytes ):
+    """Compute the machine-id UUID v4 from the supplied bytes or path (w/ the given mtime)."""
+    if machine_id_bytes is not None:
+        machine_id		= machine_id_bytes.decode( 'ASCII' ).strip()
+    else:
+        try:
+            with open( machine_id_path, 'r' ) as m_id:
+                machine_id	= m_id.read().strip()
+        except Exception:
+            # Node number is typically a much shorter integer; fill to required UUID length.
+            machine_id		= "{:0>32}".format( hex( uuid.getnode())[2:] )
     try:
         machine_id		= into_bytes( machine_id, ('hex', ) )
         assert len( machine_id ) == 16
@@ -450,6 +559,7 @@ def domainkey( product, domain, service=None, pubkey=None ):
         service			= domainkey_service( product )
     if not ( service and domain ):
         raise DKIMError( "A service and domain is required to deduce the DKIM DNS path" )
+    import dns.name					# deferred; dnspython is costly to import
     domain_name			= dns.name.from_text( domain )
     service_name		= dns.name.Name( [service, DISTRIBUTION, '_domainkey'] )
     path_name			= service_name + domain_name
@@ -509,28 +619,49 @@ class Serializable( object ):
         self._from		= f.name
         return self._from
 
+    @classmethod
+    def vars_slots( cls ):
+        """Returns the names of all (non-hidden) __slots__ attributes defined by the class and its
+        bases.  Computed once, and remembered on each class.
+
+        """
+        try:
+            return cls.__dict__['_vars_slots']
+        except KeyError:
+            pass
+        slots			= []
+        for base in cls.__mro__:
+            for key in getattr( base, '__slots__', () ):
+                if key[0] != '_' and key not in slots:  # ignore hidden _... vars, eg. _from, __dict__
+                    slots.append( key )
+        cls._vars_slots		= tuple( slots )
+        return cls._vars_slots
+
+    @classmethod
+    def vars_serializers( cls ):
+        """Returns the serializers dict for the class, including those of its bases.  Computed once,
+        and remembered on each class.
+
+        """
+        try:
+            return cls.__dict__['_vars_serializers']
+        except KeyError:
+            pass
+        serializers		= {}
+        for base in reversed( cls.__mro__ ):
+            serializers.update( base.__dict__.get( 'serializers', {} ))
+        cls._vars_serializers	= serializers
+        return serializers
+
     def vars( self ):
         """Returns all key/value pairs defined for the object, either from __slots__ and/or __dict__
         (except hidden _...)."""
-        for cls in type( self ).__mro__:
-            try:
-                vars_seq	= tuple( cls.__slots__ )  # Having a key defined but not instantiated isn't valid.
-                if '__dict__' in vars_seq:
-                    vars_seq   += tuple( self.__dict__ )
-            except AttributeError:
-                try:
-                    vars_seq	= self.__dict__
-                except AttributeError as exc:
-                    vars_seq	= ()
-                    if cls is not object:  # Only the base object() is allowed to have neither __slots__ nor __dict__
-                        log.error( "vars for base {cls!r} instance {self!r} has neither __slots__ nor __dict__: {exc}".format(
-                            cls=cls, self=self,
-                            exc=''.join( traceback.format_exception( *sys.exc_info() )) if log.isEnabledFor( logging.TRACE ) else exc ))
-                        raise
-            for key in vars_seq:
-                if key[0] == '_':  # ignore hidden _... vars, eg. _from.
-                    continue
-                yield key, getattr( self, key )
+        for key in self.vars_slots():  # Having a key defined but not instantiated isn't valid.
+            yield key, getattr( self, key )
+        for key in getattr( self, '__dict__', () ):
+            if key[0] == '_':  # ignore hidden _... vars, eg. _from.
+                continue
+            yield key, getattr( self, key )
 
     def __copy__( self ):
         """Create a new object by copying an existing object, taking __slots__ into account.
@@ -579,11 +710,7 @@ class Serializable( object ):
         """Finds any custom serialization formatter specified for the given attribute, defaults to None.
 
         """
-        for cls in type( self ).__mro__:
-            try:
-                return cls.serializers[key]
-            except (AttributeError, KeyError):
-                pass
+        return self.vars_serializers().get( key )
 
     def __getitem__( self, key ):
         """Returns the serialization of the requested key, passing thru values without a serializer.
@@ -591,7 +718,7 @@ class Serializable( object ):
         classes to represent the semantics of that object type (eg. a Timespan, ...).
 
         """
-        if key in self.keys( every=True ):
+        if key[:1] != '_' and ( key in self.vars_slots() or key in getattr( self, '__dict__', () )):
             try:
                 serialize	= self.serializer( key )  # (no Exceptions)
                 value		= getattr( self, key )    # IndexError
@@ -646,11 +773,39 @@ class Serializable( object ):
         An optional prefix string may be prepended to each line.
 
         """
-        stream			= self.JSON( indent=indent, default=default, prefix=prefix )
+        if indent is None and default is None and not prefix:
+            stream		= self.compact()
+        else:
+            stream		= self.JSON( indent=indent, default=default, prefix=prefix )
         if encoding:
             stream		= stream.encode( encoding )
         return stream
 
+    def compact( self ):
+        """Return the compact JSON serialization (as used for signing), identical to into_JSON( self ).
+        Any Serializable values (eg. License dependencies) supply their own compact serialization,
+        so any they have already computed is reused.
+
+        Equivalent to serializing each self[key] for key in self.keys(), but in one pass over the
+        object's vars, w/ the class' serializers looked up once.
+
+        """
+        serializers		= self.vars_serializers()
+        items			= []
+        for key,val in self.vars():
+            serialize		= serializers.get( key )
+            if serialize is False or val is None:
+                continue
+            empty		= getattr( val, 'empty', None )
+            if empty is not None and hasattr( empty, '__call__' ) and empty():
+                continue
+            items.append( (key, serialize( val ) if serialize else val) )
+        items.sort( key=lambda kv: kv[0] )
+        return '{' + ','.join(
+            json.dumps( key ) + ':' + into_JSON_compact( val )
+            for key,val in items
+        ) + '}'
+
     def sign( self, sigkey, pubkey=None ):
         """Sign our default serialization, and (optionally) confirm that the supplied public key
         (which will be used to check the signature) is correct, by re-deriving the public key.
@@ -682,19 +837,31 @@ class Serializable( object ):
                            + () if signature else ('signature',) ))
         return ed25519.crypto_sign_open( signature + self.serialize(), pubkey )
 
-    def digest( self, encoding=None, decoding=None ):
+    def digest( self, encoding=None, decoding=None, algorithm=None ):
         """The SHA-256 hash of the serialization, as 32 bytes.  Optionally, encode w/ a named codec,
         eg.  "hex" or "base64".  Often, these will require a subsequent .decode( 'ASCII' ) to become
         a non-binary str.
 
+        Another hash algorithm may be specified, eg. any supported by hashlib.new, or "blake3" (if
+        the blake3 package is installed).  The default SHA-256 digest is the one used for equality
+        and hashing.
+
         """
-        binary			= hashlib.sha256( self.serialize() ).digest()
+        if algorithm in (None, 'sha256'):
+            binary		= self._digest()
+        elif algorithm == 'blake3' and blake3:
+            binary		= blake3( self.serialize() ).digest()
+        else:
+            binary		= hashlib.new( algorithm, self.serialize() ).digest()
         if encoding is not None:
             binary		= codecs.getencoder( encoding )( binary )[0].replace(b'\n', b'')
             if decoding is not None:
                 return binary.decode( decoding )
         return binary
 
+    def _digest( self ):
+        return hashlib.sha256( self.serialize() ).digest()
+
     def __eq__( self, other ):
         """Serializable things should produce the same digest if equal.  There may be simpler or
         better equality tests, but this is the semantic for Serializable things or their hashes.
@@ -731,6 +898,53 @@ class Serializable( object ):
         return self.digest( 'base64', 'ASCII' )
 
 
+class SerializableCached( Serializable ):
+    """A Serializable that remembers its str, compact and default serialization and digest once
+    computed.  Any attribute assignment discards them.  Modifying a contained object in-place does
+    not, so this is only suitable for things that are effectively immutable once constructed (eg. a
+    License, whose dependencies are a tuple).  Nothing in this API modifies a License's (or
+    LicenseSigned's) contained objects in a way that changes their serialization.
+
+    """
+
+    __slots__			= ('_str', '_compact', '_serialized', '_digested')
+
+    def __setattr__( self, key, value ):
+        if key[0] != '_':
+            super( SerializableCached, self ).__setattr__( '_str', None )
+            super( SerializableCached, self ).__setattr__( '_compact', None )
+            super( SerializableCached, self ).__setattr__( '_serialized', None )
+            super( SerializableCached, self ).__setattr__( '_digested', None )
+        super( SerializableCached, self ).__setattr__( key, value )
+
+    def __str__( self ):
+        string			= getattr( self, '_str', None )
+        if string is None:
+            string = self._str	= super( SerializableCached, self ).__str__()
+        return string
+
+    def compact( self ):
+        compact			= getattr( self, '_compact', None )
+        if compact is None:
+            compact = self._compact = super( SerializableCached, self ).compact()
+        return compact
+
+    def serialize( self, indent=None, encoding='UTF-8', default=None, prefix=None ):
+        if indent is not None or encoding != 'UTF-8' or default is not None or prefix is not None:
+            return super( SerializableCached, self ).serialize(
+                indent=indent, encoding=encoding, default=default, prefix=prefix )
+        serialized		= getattr( self, '_serialized', None )
+        if serialized is None:
+            serialized = self._serialized = super( SerializableCached, self ).serialize()
+        return serialized
+
+    def _digest( self ):
+        digested		= getattr( self, '_digested', None )
+        if digested is None:
+            digested = self._digested = super( SerializableCached, self )._digest()
+        return digested
+
+
 class IssueRequest( Serializable ):
     __slots__			= (
         'author', 'author_pubkey', 'product',
@@ -752,11 +966,24 @@ class IssueRequest( Serializable ):
         self.machine		= into_UUIDv4( machine )
         super( IssueRequest, self ).__init__( **kwds )
 
+    # The query's keys, in sorted order.  Any with a value of None are omitted, as in dict( self ).
+    query_keys			= (
+        'author', 'author_pubkey', 'client', 'client_pubkey', 'machine', 'product', 'signature'
+    )
+
     def query( self, sigkey ):
-        """Issue query is sorted-key order"""
-        qd			= dict( self )
-        qd['signature']		= into_b64( self.sign( sigkey=sigkey ))
-        return urlencode( sorted( qd.items() ))
+        """Issue query is sorted-key order.  The sigkey may be a Keypair, raw 64-byte signing key, or
+        its base64 encoding.  Equivalent to urlencode( sorted( dict( self, signature=... ).items() )),
+        but directly encodes our fixed set of keys."""
+        signature		= into_b64( self.sign( sigkey=sigkey ))
+        return '&'.join(
+            key + '=' + quote_plus( val )
+            for key,val in (
+                ( key, signature if key == 'signature' else self[key] )
+                for key in self.query_keys
+            )
+            if val is not None
+        )
 
 
 def overlap_intersect( start, length, other ):
@@ -1327,7 +1554,7 @@ class Grant( Serializable ):
         return self
 
 
-class License( Serializable ):
+class License( SerializableCached ):
     """Represents the details of a Licence from an author to a client (could be any client, if no
     client or client.pubkey provided).  Cannot be constructed unless the supplied License details
     are valid with respect to the License dependencies it 'has', and grants capabilities 'for'
@@ -1601,10 +1828,11 @@ class License( Serializable ):
         except Exception as exc:
             raise LicenseIncompatibility( "License grant invalid: {exc}".format( exc=exc ))
 
-        # Reconstitute LicenseSigned provenance from any dicts provided
+        # Reconstitute LicenseSigned provenance from any dicts provided.  A tuple, so they cannot be
+        # modified in-place (making any cached serialization stale).
         self.dependencies	= None
         if dependencies is not None:
-            self.dependencies	= list(
+            self.dependencies	= tuple(
                 prov
                 if isinstance( prov, LicenseSigned )
                 else LicenseSigned( confirm=confirm, machine_id_path=machine_id_path, **dict( prov ))
@@ -1639,6 +1867,30 @@ class License( Serializable ):
                     ))
         return start, length
 
+    def verify_signature( self, signature ):
+        """Confirm that the signature was produced by the signing key corresponding to the License
+        author's public key, or raise a LicenseIncompatibility."""
+        try:
+            super( License, self ).verify( pubkey=self.author.pubkey, signature=signature )
+        except Exception as exc:
+            raise LicenseIncompatibility(
+                "License for {auth}'s {prod!r}: signature mismatch: {sig!r}; {exc}".format(
+                    auth	= self.author.name,
+                    prod	= self.author.product,
+                    sig		= into_b64( signature ),
+                    exc		= exc,
+                ))
+
+    def dkim_paths( self ):
+        """Yield the DKIM paths of this License's author (and of its License dependencies' authors),
+        for those that can be confirmed; ie. that supplied a .domain and a .product/.service."""
+        if self.author.domain and self.author.servicekey:
+            yield self.author.domainkey[0]
+        for prov in self.dependencies or []:
+            if isinstance( prov, LicenseSigned ):
+                for path in prov.license.dkim_paths():
+                    yield path
+
     def verify(
         self,
         author_pubkey	= None,
@@ -1646,6 +1898,7 @@ class License( Serializable ):
         confirm		= None,
         machine_id_path	= None,
         dependencies	= None,  # Defaults to not include this LicenseSigned in returned constraints['dependencies']
+        batch		= None,  # True (or a list) defers all Ed25519 signature checks to one verify_batch
         **constraints
     ):
         """Verify that the License is valid:
@@ -1663,7 +1916,14 @@ class License( Serializable ):
         constructing a new License (assuming at least the necessary author, author_domain and
         product were defined).
 
+        If batch is True, the signatures of this License and all of its License dependencies are
+        collected and checked together by verify_batch, instead of one at a time.
+
         """
+        batch_owner		= batch is True
+        if batch_owner:
+            batch		= []
+
         if author_pubkey:
             author_pubkey, _	= into_keys( author_pubkey )
             assert author_pubkey, "Unrecognized author_pubkey provided"
@@ -1682,6 +1942,10 @@ class License( Serializable ):
         # .product/.service to deduce a .servicekey (eg. for a License issued locally to an end-user
         # Agent ID), we don't validate the pubkey.  If you are a License author w/ a DKIM and want
         # validation, ensure you provide a .domain and a .product/.service when you author Licenses!
+        if ( confirm or confirm is None ) and self.dependencies:
+            # Query the DKIM records of every author in the License dependency tree concurrently,
+            # instead of one network round-trip at a time as each License is verified, below.
+            doh.prefetch( self.dkim_paths(), 'TXT' )
         if ( confirm or confirm is None ) and self.author.domain and self.author.servicekey:
             avkey	 	= self.author.pubkey_query()
             if avkey != self.author.pubkey:
@@ -1695,16 +1959,10 @@ class License( Serializable ):
         # Verify that the License signature was indeed produced by the signing key corresponding to
         # the provided public key
         if signature:
-            try:
-                super( License, self ).verify( pubkey=self.author.pubkey, signature=signature )
-            except Exception as exc:
-                raise LicenseIncompatibility(
-                    "License for {auth}'s {prod!r}: signature mismatch: {sig!r}; {exc}".format(
-                        auth	= self.author.name,
-                        prod	= self.author.product,
-                        sig	= into_b64( signature ),
-                        exc	= exc,
-                    ))
+            if batch is None:
+                self.verify_signature( signature )
+            else:
+                batch.append( (self, signature) )
 
         # Verify any License dependencies are valid; signed w/ DKIM specified key, License OK.  When
         # verifying License dependencies, we don't supply the constraints and decline inclusion of
@@ -1718,9 +1976,10 @@ class License( Serializable ):
         # encounter any anonymous License dependencies -- any capabilities they grant cannot be
         # assumed to be "for" the licensee; the Agent authoring the present license.
         for prov_dct in self.dependencies or []:
-            prov		= LicenseSigned( confirm=confirm, machine_id_path=machine_id_path, **prov_dct )
+            prov		= prov_dct if isinstance( prov_dct, LicenseSigned ) \
+                else LicenseSigned( confirm=confirm, machine_id_path=machine_id_path, **prov_dct )
             try:
-                prov.verify( confirm=confirm, machine_id_path=machine_id_path )
+                prov.verify( confirm=confirm, machine_id_path=machine_id_path, batch=batch )
                 assert prov.license.client is None or prov.license.client.pubkey is None or prov.license.client.pubkey == self.author.pubkey, \
                     "sub-License client public key {client_pubkey} doesn't match Licence author's public key {author_pubkey}".format(
                         client_pubkey	= into_b64( prov.license.client.pubkey ),
@@ -1736,6 +1995,10 @@ class License( Serializable ):
                         exc		= exc,
                     ))
 
+        # All signatures in the License dependency tree have been collected; check them at once.
+        if batch_owner:
+            verify_batch( batch )
+
         # Enforce all constraints, returning a dict suitable for creating a specialized License, if
         # a signature was provided; if not, we cannot produce a specialized sub-License, and must
         # fail.
@@ -1844,7 +2107,7 @@ class License( Serializable ):
         return constraints
 
 
-class LicenseSigned( Serializable ):
+class LicenseSigned( SerializableCached ):
     """A License and its Ed25519 Signature provenance.  Only a LicenseSigned (and confirmation of
     the author's public key) proves that a License was actually issued by the purported author.  It
     is expected that authors will only sign a valid License.
@@ -2000,6 +2263,7 @@ class LicenseSigned( Serializable ):
         confirm		= None,
         machine_id_path	= None,
         dependencies	= None,
+        batch		= None,
         **constraints
     ):
         return self.license.verify(
@@ -2008,6 +2272,7 @@ class LicenseSigned( Serializable ):
             confirm		= confirm,
             machine_id_path	= machine_id_path,
             dependencies	= dependencies,
+            batch		= batch,
             **constraints
         )
 
@@ -2151,7 +2416,7 @@ class KeypairEncrypted( Serializable ):
             cipher		= ChaCha20Poly1305( key )
             plaintext		= bytearray( seed )
             nonce		= self.salt
-            self.ciphertext	= bytes( cipher.encrypt( nonce, plaintext ))
+            self.ciphertext	= bytes( cipher.encrypt( nonce, plaintext, None ))
         if username and password:
             # Verify MAC by decrypting w/ username and password, if provided
             keypair_rec		= self.into_keypair( username=username, password=password )
@@ -2210,7 +2475,7 @@ class KeypairEncrypted( Serializable ):
         nonce			= self.salt
         ciphertext		= bytearray( self.ciphertext )
         try:
-            plaintext		= bytes( cipher.decrypt( nonce, ciphertext ))
+            plaintext		= bytes( cipher.decrypt( nonce, ciphertext, None ))
         except Exception:
             raise KeypairCredentialError(
                 "Failed to decrypt ChaCha20Poly1305-encrypted Keypair w/ {}'s credentials".format( username ))
@@ -2481,6 +2746,7 @@ def verify(
     confirm		= None,
     machine_id_path	= None,
     dependencies	= None,
+    batch		= None,
     **constraints
 ):
     """Verify that the supplied License or LicenseSigned contains a valid signature, and that the
@@ -2504,6 +2770,8 @@ def verify(
     designated client Agent, with the target verified License itself in the dependencies list,
     producing a new License which sub-licenses the just verified License.
 
+    With batch=True, all Ed25519 signatures in the License dependency tree are verified together.
+
     """
     return provenance.verify(
         author_pubkey	= author_pubkey,
@@ -2511,10 +2779,30 @@ def verify(
         confirm		= confirm,
         machine_id_path	= machine_id_path,
         dependencies	= True if dependencies is None else dependencies,
+        batch		= batch,
         **constraints
     )
 
 
+def verify_batch( entries ):
+    """Verify a sequence of (License, signature) entries in a single Ed25519 batch verification,
+    which is much faster than checking each signature individually.  If the batch fails, each entry
+    is checked in turn, raising a LicenseIncompatibility identifying the first invalid signature.
+
+    """
+    entries			= list( entries )
+    try:
+        ed25519.crypto_sign_open_batch(
+            [ signature + lic.serialize() for lic,signature in entries ],
+            [ lic.author.pubkey for lic,signature in entries ],
+        )
+    except Exception as exc:
+        log.info( "Batch verification of {n} signatures failed: {exc}".format( n=len( entries ), exc=exc ))
+        for lic,signature in entries:
+            lic.verify_signature( signature )
+        raise  # Batch failed, but no individual signature did!?
+
+
 def load(
     mode	= None,
     extension	= None,
@@ -2540,9 +2828,9 @@ def load(
     ):
         with f:
             prov_ser		= f.read()
-            prov_dict		= json.loads( prov_ser )
-            prov		= LicenseSigned(
-                confirm=confirm, machine_id_path=machine_id_path, _from=f.name, **prov_dict )
+        prov_dict		= json.loads( prov_ser )
+        prov			= LicenseSigned(
+            confirm=confirm, machine_id_path=machine_id_path, _from=f.name, **prov_dict )
         yield prov._from, prov
 
 
@@ -2744,6 +3032,7 @@ def check_nolog(
     confirm		= None,
     machine_id_path	= None,
     constraints		= None,
+    batch		= None,			# Verify License signatures w/ one verify_batch
     **kwds  # eg. {base,file}name, package, extra=["..."], reverse_save, other open() args; see config_open
 ):
     """Load our agent key(s), check that License(s) have been (or can be) issued to our agent, for
@@ -2827,6 +3116,7 @@ def check_nolog(
                     confirm		= confirm,
                     machine_id_path	= machine_id_path,
                     dependencies	= False,
+                    batch		= batch,
                     **( constraints or {} )
                 )
             except Exception as exc:
@@ -2849,6 +3139,7 @@ def check_nolog(
                     confirm		= confirm,
                     machine_id_path	= machine_id_path,
                     dependencies	= True,
+                    batch		= batch,
                     **( constraints or {} )
                 )
             except Exception as exc:
@@ -8,29 +8,43 @@ except ImportError:
 
 import binascii
 import codecs
+import collections
 import copy
+import datetime
+import hashlib
 import json
 import logging
 import os
 import pytest
+import sys
+import threading
+import uuid
 
 import pytz
 
+from enum		import Enum
+
 try:
     import chacha20poly1305
 except ImportError:
     chacha20poly1305		= None
 
-from dns.exception	import DNSException
+try:
+    from dns.exception	import DNSException
+except ImportError:
+    class DNSException( Exception ):
+        pass
+
 from .verification	import (
     License, LicenseSigned, LicenseIncompatibility, Timespan, Agent,
     KeypairPlaintext, KeypairEncrypted, machine_UUIDv4,
     domainkey, domainkey_service, overlap_intersect,
     into_b64, into_hex, into_str, into_str_UTC, into_JSON, into_keys, into_bytes,
     into_Timestamp, into_Duration,
-    authoring, issue, verify, load, load_keypairs, check, authorized,
+    authoring, issue, verify, verify_batch, load, load_keypairs, check, authorized,
     DKIM_pubkey, DKIMError,
 )
+from .			import verification
 from ..			import ed25519
 
 from ..misc 		import (
@@ -44,12 +58,13 @@ dominion_sigkey			= binascii.unhexlify(
     '431f3fb4339144cb5bdeb77db3148a5d340269fa3bc0bf2bf598ce0625750fdca991119e30d96539a70cd34983dd00714259f8b60a2163bdb748f3fc0cf036c9' )
 awesome_sigkey			= binascii.unhexlify(
     '4e4d27b26b6f4db69871709d68da53854bd61aeee70e63e3b3ff124379c1c6147321ce7a2fb87395fe0ff9e2416bc31b9a25475aa2e2375d70f4c326ffd47eb4' )
-enduser_seed			= binascii.unhexlify( '00' * 32 )
+enduser_seed			= b'\x00' * 32
 
 username			= 'a@b.c'
 password			= 'password'
 
 machine_id_path			= __file__.replace( ".py", ".machine-id" )
+dirname				= os.path.dirname( __file__ )  # This test's directory
 
 
 def test_Agent():
@@ -208,7 +223,7 @@ def test_KeypairEncrypted_load_keypairs():
     # load just the one encrypted crypto-keypair (no glob wildcard on extension)
     (keyname,keypair_encrypted,keycred,keypair), = load_keypairs(
         extension="crypto-keypair", username=username, password=password,
-        extra=[os.path.dirname( __file__ )], filename=__file__, detail=True )
+        extra=[dirname], filename=__file__, detail=True )
     assert keycred == dict( username=username, password=password )
     assert enduser_keypair == keypair_encrypted.into_keypair( **keycred ) == keypair
 
@@ -217,17 +232,95 @@ def test_KeypairPlaintext_load_keypairs():
     enduser_keypair		= authoring( seed=enduser_seed, why="from enduser seed" )
     (keyname,keypair_plaintext,keycred,keypair), = load_keypairs(
         extension="crypto-keypair-plaintext",
-        extra=[os.path.dirname( __file__ )], filename=__file__, detail=True )
+        extra=[dirname], filename=__file__, detail=True )
     assert keycred == {}
     assert enduser_keypair == keypair_plaintext.into_keypair( **keycred ) == keypair
 
 
+def test_into_JSON():
+    """The compact and indented serializations are identical, whether produced by orjson or json."""
+    for thing in (
+        dict( b=1e16, a=0.1, c=[ 1, 2.5, -3e-05 ] ),
+        dict( name=u"Caf\u00e9", product="\x00\n" ),
+        dict( nothing=None, nan=float( 'nan' ), big=2**70 ),
+        dict( timespan=Timespan( "2021-09-30 17:22:33 UTC", "1y" )),
+        dict( empty=dict(), nested=[ [], [ dict( k='"v": ' ) ], dict( x=1 ) ] ),
+    ):
+        for indent in ( None, 1, 4 ):
+            assert into_JSON( thing, indent=indent ) \
+                == json.dumps( thing, sort_keys=True, indent=indent, separators=(',', ':'), default=dict )
+
+    # Values orjson would serialize differently from json.dumps (w/ a default=str); the signed
+    # compact serialization (and the indented form) must never depend on whether orjson is installed
+    class Choice( Enum ):
+        A			= 1
+    for thing in (
+        dict( rubout="\x7f" ),
+        dict( when=datetime.datetime( 2021, 1, 1, tzinfo=pytz.UTC )),
+        dict( choice=Choice.A ),
+        dict( machine=uuid.UUID( int=5 ), pair=collections.namedtuple( 'Pair', 'a b' )( 1, 2.5 )),
+    ):
+        for indent in ( None, 1, 4 ):
+            assert into_JSON( thing, indent=indent, default=str ) \
+                == json.dumps( thing, sort_keys=True, indent=indent, separators=(',', ':'), default=str )
+
+    # Serializables splice in the compact serialization of their (eg. LicenseSigned dependency) values
+    with open( os.path.join( dirname, "verification_test." + LICEXTENSION ), 'r' ) as f:
+        prov			= LicenseSigned( confirm=False, machine_id_path=False, **json.loads( f.read() ))
+    assert prov.license.dependencies
+    assert prov.serialize().decode( 'UTF-8' ) == into_JSON( prov ) \
+        == json.dumps( prov, sort_keys=True, separators=(',', ':'), default=dict )
+
+
+def test_machine_UUIDv4( tmp_path ):
+    """The machine-id UUID is remembered, until the machine-id file is modified."""
+    path			= str( tmp_path / "machine-id" )
+    with open( path, 'w' ) as f:
+        f.write( "000102030405060708090a0b0c0d0e0f\n" )
+    assert machine_UUIDv4( machine_id_path=path ) == machine_UUIDv4( machine_id_path=machine_id_path )
+    with open( path, 'w' ) as f:
+        f.write( "0f0e0d0c0b0a09080706050403020100\n" )
+    os.utime( path, (0, 0) )
+    assert machine_UUIDv4( machine_id_path=path ).hex == "0f0e0d0c0b0a49088706050403020100"
+
+    # Concurrent (eg. web request) Threads may share the memoized machine-id UUIDs, even as they are
+    # ejected; more distinct machine-ids than are remembered are used.
+    failures			= []
+
+    def probe( seed ):
+        try:
+            for n in range( 200 ):
+                machine_id	= "{:032x}".format(( seed * 200 + n ) % 32 )
+                assert machine_UUIDv4( machine_id_bytes=machine_id.encode( 'ASCII' )).hex[-12:] \
+                    == machine_id[-12:]
+        except Exception as exc:
+            failures.append( exc )
+
+    switching			= getattr( sys, 'getswitchinterval', None )
+    if switching:
+        interval		= sys.getswitchinterval()
+        sys.setswitchinterval( 1e-6 )			# Switch Threads as often as possible
+    try:
+        threads			= [ threading.Thread( target=probe, args=(seed,) ) for seed in range( 8 ) ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        if switching:
+            sys.setswitchinterval( interval )
+    assert not failures, "machine_UUIDv4 failed in Threads: {}".format( failures[:3] )
+
+
 def test_License_serialization():
     # Deduce the basename from our __file__ (note: this is destructuring a 1-element sequence from a
     # generator!)
-    (provname,prov), = load( extra=[os.path.dirname( __file__ )], filename=__file__, confirm=False )
-    with open( os.path.join( os.path.dirname( __file__ ), "verification_test.crypto-license" )) as f:
+    (provname,prov), = load( extra=[dirname], filename=__file__, confirm=False )
+    with open( os.path.join( dirname, "verification_test.crypto-license" )) as f:
         assert str( prov ) == f.read()
+    # Each load yields a new LicenseSigned; one caller's changes to it are not seen by others
+    (_,again), = load( extra=[dirname], filename=__file__, confirm=False )
+    assert again is not prov and again == prov
 
 
 def test_License_base( monkeypatch ):
@@ -288,6 +381,17 @@ def test_License_base( monkeypatch ):
         assert lic.digest() == b"c'\x1fh\x14\x90\x1fF)c\x985_Q\xc7`\x0b\xab@U3\xbf1\xd6\x05\x05\x9f\x16O\x0c\x80\xda"
         assert lic.digest('hex', 'ASCII' ) == '63271f6814901f46296398355f51c7600bab405533bf31d605059f164f0c80da'
 
+    assert lic.digest( algorithm='sha256' ) == lic.digest()
+    assert len( lic.digest( algorithm='sha512' )) == 64
+
+    # The serialization and digest are computed once, and discarded if the License is altered
+    assert lic.serialize() is lic.serialize()
+    lic_digest = lic.digest()
+    lic.machine = machine_UUIDv4( machine_id_path=machine_id_path )
+    assert lic.digest() != lic_digest
+    lic.machine = None
+    assert lic.digest() == lic_digest
+
     keypair = ed25519.crypto_sign_keypair( dominion_sigkey[:32] )
     assert keypair.sk == dominion_sigkey
     assert lic.author.pubkey == b'\xa9\x91\x11\x9e0\xd9e9\xa7\x0c\xd3I\x83\xdd\x00qBY\xf8\xb6\n!c\xbd\xb7H\xf3\xfc\x0c\xf06\xc9'
@@ -630,6 +734,143 @@ def test_LicenseSigned():
     "signature":"hd4/vmsWK6yJc6v+X6reYWz6Q1rblGQe3Y6VLP9d1UoxsEfmfBxc8D4RIg3FH2upodgIJRx5IFc6mUBgYUrqAw=="
 }"""
 
+    # The 3-level License dependency chain verifies identically w/ its signatures checked in a batch
+    assert into_JSON( verify(
+        lic_host_prov,
+        confirm		= False,
+        machine_id_path	= machine_id_path,
+        dependencies	= False,
+        batch		= True,
+    )) == into_JSON( verify(
+        lic_host_prov,
+        confirm		= False,
+        machine_id_path	= machine_id_path,
+        dependencies	= False,
+    ))
+    # ..and a batch w/ a bad signature identifies it
+    with pytest.raises( LicenseIncompatibility ) as exc_info:
+        verify_batch( [
+            (lic_host_prov.license, lic_host_prov.signature),
+            (drv_prov.license, lic_host_prov.signature),
+        ] )
+    assert "EtherNet/IP Tool" in str( exc_info.value )
+
+
+def test_LicenseSigned_batch( monkeypatch ):
+    """A License's and its dependencies' signatures are verified in one batch, w/o DKIM (or any
+    network) access.  A bad signature is identified by checking each signature individually."""
+    batches			= []
+
+    def verify_batch_spy( entries ):
+        entries			= list( entries )
+        batches.append( len( entries ))
+        return verify_batch( entries )
+    monkeypatch.setattr( verification, 'verify_batch', verify_batch_spy )
+
+    awesome_keypair		= authoring( seed=awesome_sigkey[:32] )
+    enduser_keypair		= authoring( seed=enduser_seed )
+    lic_prov			= issue( License(
+        author	= dict(
+            name	= "Dominion Research & Development Corp.",
+            product	= "Cpppo Test",
+            domain	= "dominionrnd.com",
+            pubkey	= dominion_sigkey[32:],
+        ),
+        client	= dict(
+            name	= "Awesome, Inc.",
+            pubkey	= awesome_keypair.vk,
+        ),
+        timespan	= Timespan( "2021-09-30 11:22:33 Canada/Mountain", "1y" ),
+        confirm		= False,
+    ), dominion_sigkey, confirm=False )
+    drv_prov			= issue( License(
+        author	= dict(
+            name	= "Awesome, Inc.",
+            product	= "EtherNet/IP Tool",
+            domain	= "awesome-inc.com",
+            pubkey	= awesome_keypair.vk,
+        ),
+        client	= dict(
+            name	= "End User, LLC",
+            pubkey	= enduser_keypair.vk,
+        ),
+        dependencies	= [ lic_prov ],
+        timespan	= Timespan( "2022-09-29 11:22:33 Canada/Mountain", "1y" ),
+        confirm		= False,
+    ), awesome_keypair.sk, confirm=False )
+
+    del batches[:]
+    assert verify( drv_prov, confirm=False, dependencies=False, batch=True ) \
+        == verify( drv_prov, confirm=False, dependencies=False )
+    assert batches == [ 2 ]
+
+    # The License's own signature is bad, but its dependency's is good; only it is identified
+    with pytest.raises( LicenseIncompatibility ) as exc_info:
+        verify( drv_prov.license, signature=lic_prov.signature, confirm=False, batch=True )
+    assert batches == [ 2, 2 ]
+    assert str( exc_info.value ).startswith(
+        "License for Awesome, Inc.'s 'EtherNet/IP Tool': signature mismatch" )
+
+
+def test_LicenseSigned_cached():
+    """The cached str, serialization and digest of a LicenseSigned (and its License dependencies) are
+    never stale; nothing in the API modifies a License's contained objects in-place."""
+    awesome_keypair		= authoring( seed=awesome_sigkey[:32] )
+    enduser_keypair		= authoring( seed=enduser_seed )
+    lic_prov			= issue( License(
+        author	= dict(
+            name	= "Dominion Research & Development Corp.",
+            product	= "Cpppo Test",
+            domain	= "dominionrnd.com",
+            pubkey	= dominion_sigkey[32:],
+        ),
+        client	= dict(
+            name	= "Awesome, Inc.",
+            pubkey	= awesome_keypair.vk,
+        ),
+        timespan	= Timespan( "2021-09-30 11:22:33 Canada/Mountain", "1y" ),
+        grant		= { "cpppo-test": { "Hz": 1000 }},
+        confirm		= False,
+    ), dominion_sigkey, confirm=False )
+    drv_prov			= issue( License(
+        author	= dict(
+            name	= "Awesome, Inc.",
+            product	= "EtherNet/IP Tool",
+            domain	= "awesome-inc.com",
+            pubkey	= awesome_keypair.vk,
+        ),
+        client	= dict(
+            name	= "End User, LLC",
+            pubkey	= enduser_keypair.vk,
+        ),
+        dependencies	= [ lic_prov ],
+        timespan	= Timespan( "2022-09-29 11:22:33 Canada/Mountain", "1y" ),
+        grant		= { "cpppo-test": { "Hz": 500 }, "ethernet-ip-tool": { "Hz": 50 }},
+        confirm		= False,
+    ), awesome_keypair.sk, confirm=False )
+
+    def fresh( prov ):
+        """Confirm that the cached serializations match those computed afresh (uncached)."""
+        for ser in ( prov, prov.license, prov.license.dependencies[0], prov.license.dependencies[0].license ):
+            serialized		= into_JSON( ser ).encode( 'UTF-8' )
+            assert ser.serialize() == serialized
+            assert ser.compact() == serialized.decode( 'UTF-8' )
+            assert ser.digest() == hashlib.sha256( serialized ).digest()
+            assert str( ser ) == into_JSON( ser, indent=4 )
+
+    fresh( drv_prov )
+    drv_prov.grants()
+    fresh( drv_prov )
+    verify( drv_prov, confirm=False, batch=True, machine=None )
+    fresh( drv_prov )
+    License( author=dict( name="End User, LLC", product="application", pubkey=enduser_keypair.vk ),
+             confirm=False, **verify( drv_prov, confirm=False ))
+    fresh( drv_prov )
+
+    # The License dependencies cannot be altered in-place
+    with pytest.raises( AttributeError ):
+        drv_prov.license.dependencies.append( lic_prov )
+
 
 def test_licensing_check():
     checked			= dict(
@@ -638,7 +879,7 @@ def test_licensing_check():
             filename=__file__, package=__package__,  # filename takes precedence
             username="a@b.c", password="passwor", confirm=False,
             machine_id_path	= machine_id_path,
-            extra		= [os.path.dirname( __file__ )],
+            extra		= [dirname],
         )
     )
     assert len( checked ) == 1  # bad password, but same key is available in plaintext
@@ -648,13 +889,12 @@ def test_licensing_check():
             filename=__file__, package=__package__,  # filename takes precedence
             username="a@b.c", password="password", confirm=False,
             machine_id_path	= machine_id_path,
-            extra		= [os.path.dirname( __file__ )],
+            extra		= [dirname],
         )
     )
     assert len( checked ) == 1
-    checked_str		= into_JSON( checked, indent=4, default=str )
-    #print( checked_str )
-    assert checked_str == """\
+    #print( into_JSON( checked, indent=4, default=str ))
+    assert json.loads( into_JSON( checked, default=str )) == json.loads( """\
 {
     "O2onvM62pC1io6jQKm8Nc2UyFXcd4kOmOsBIoYtZ2ik=":{
         "license":{
@@ -707,7 +947,7 @@ def test_licensing_check():
         },
         "signature":"aGPcJUI+arV24ipAWfJJxTOhLGKMG51Vzob7mhldYme+qxU/amnUgPNUKY3iqnK7jbT7BbFIx4aywUGuh9p6BQ=="
     }
-}"""
+}""" )
 
     # Now, check that we can issue the license to our machine-id.  Since we don't specify a client,
     # any client Agent Keypair could sub-license this License, on that machine-id.
@@ -717,16 +957,15 @@ def test_licensing_check():
             filename=__file__, package=__package__,  # filename takes precedence
             username="a@b.c", password="password", confirm=False,
             machine_id_path	= machine_id_path,
-            extra		= [os.path.dirname( __file__ )],
+            extra		= [dirname],
             constraints		= dict(
                 machine	= True,
             )
         )
     )
     assert len( checked_mach ) == 1
-    checked_mach_str	= into_JSON( checked_mach, indent=4, default=str )
-    print( checked_mach_str )
-    assert checked_mach_str == """\
+    #print( into_JSON( checked_mach, indent=4, default=str ))
+    assert json.loads( into_JSON( checked_mach, default=str )) == json.loads( """\
 {
     "O2onvM62pC1io6jQKm8Nc2UyFXcd4kOmOsBIoYtZ2ik=":{
         "license":{
@@ -780,7 +1019,7 @@ def test_licensing_check():
         },
         "signature":"YZSrREYtzPR/O/12NaH6RcKRWToINaYF6ZN1nPgmT8Cc9y7r/18hssiXKqOcA963497u7DuhftcMYd1q1AQwAA=="
     }
-}"""
+}""" )
 
 
 def test_licensing_authorized( tmp_path ):
@@ -804,7 +1043,7 @@ def test_licensing_authorized( tmp_path ):
             confirm	= False,
             machine_id_path = machine_id_path,
             extra	= [
-                os.path.dirname( __file__ )  # This test's directory
+                dirname  # This test's directory
             ],
             constraints	= dict(
                 machine	= True,
@@ -916,7 +1155,7 @@ def test_licensing_authorized( tmp_path ):
             confirm	= False,
             reverse_save = True,  # Save in most specific (instead of most general) location
             extra	= [      # config_paths and extras are always in general to specific order
-                os.path.dirname( __file__ ),  # Our verification_test.crypto-keypair... file w/ O2o...2ik=
+                dirname,  # Our verification_test.crypto-keypair... file w/ O2o...2ik=
                 str( tmp_path ),     # so make sure we write here first (in reverse_save)
             ],
         )
@@ -18,7 +18,7 @@
 
 from __future__ import absolute_import, print_function, division
 try:
-    from future_builtins import zip, map		# Use Python 3 "lazy" zip, map
+    from future_builtins import zip			# Use Python 3 "lazy" zip
 except ImportError:
     pass
 
@@ -30,10 +30,10 @@ import types
 import getpass
 import glob
 import logging
-import math
 import os
 import re
 import sys
+import threading
 import time
 import traceback
 
@@ -86,20 +86,35 @@ except NameError:
     unicode			= str
 
 try:
-    from urllib		import urlencode, unquote       # noqa: F401
+    from urllib		import urlencode, unquote, quote_plus  # noqa: F401
+    from urlparse	import parse_qsl		# noqa: F401
 except ImportError:
-    from urllib.parse	import urlencode, unquote       # noqa: F401
+    from urllib.parse	import urlencode, unquote, quote_plus  # noqa: F401
+    from urllib.parse	import parse_qsl		# noqa: F401
 
 try:  # Python2
     from urllib2	import urlopen, Request		# noqa: F401
 except ImportError:  # Python3
     from urllib.request	import urlopen, Request		# noqa: F401
 
+try:  # Python3
+    import http.client as httplib			# noqa: F401
+except ImportError:  # Python2
+    import httplib					# noqa: F401
+
 try:
     import pathlib					# noqa: F401
 except ImportError:
     import pathlib2 as pathlib				# noqa: F401
 
+try:
+    from os		import scandir			# noqa: F401
+except ImportError:  # Python2; use the scandir package, if available
+    try:
+        from scandir	import scandir			# noqa: F401
+    except ImportError:
+        scandir			= None
+
 # Use secrets.token_bytes for random number generation; supply for Python <3.6
 try:
     from secrets	import token_bytes, DEFAULT_ENTROPY
@@ -347,26 +362,39 @@ def memoize( maxsize=None, maxage=None, log_at=None ):
     purged.
 
     Optionally logs when we memoize something, at level log_at.
+
+    Thread-safe; the memo is only accessed while holding wrapper._lock (as must anyone manipulating
+    wrapper._memo/_stat directly).  The function itself is called without the lock held, so
+    concurrent callers missing the memo for the same args may each compute it.
     """
     def decorator( func ):
         @wraps( func )
         def wrapper( *args, **kwds ):
             now			= timer()
-            # A 0 hits count is our sentinel indicating args not memo-ized
-            last,hits		= wrapper._stat.get( args, (now,0) )
-            if not hits or ( maxage and ( now - last > maxage )):
-                entry = wrapper._memo[args] = func( *args, **kwds )
-                if log_at and log.isEnabledFor( log_at ):
-                    if hits:
-                        log.log( log_at, "{} Refreshed {!r} == {!r}".format( wrapper.__name__, args, entry ))
-                    else:
-                        log.log( log_at, "{} Memoizing {!r} == {!r}".format( wrapper.__name__, args, entry ))
-            else:
-                entry		= wrapper._memo[args]
-                #log.detail( "{} Remembers {!r} == {!r}".format( wrapper.__name__, args, entry ))
-            hits	       += 1
-            wrapper._stat[args] = (now,hits)
+            with wrapper._lock:
+                # A 0 hits count is our sentinel indicating args not memo-ized
+                last,hits	= wrapper._stat.get( args, (now,0) )
+                if hits and not ( maxage and ( now - last > maxage )):
+                    wrapper._stat[args] = (now,hits+1)
+                    #log.detail( "{} Remembers {!r} == {!r}".format( wrapper.__name__, args, wrapper._memo[args] ))
+                    return wrapper._memo[args]
+
+            entry		= func( *args, **kwds )
+            if log_at and log.isEnabledFor( log_at ):
+                if hits:
+                    log.log( log_at, "{} Refreshed {!r} == {!r}".format( wrapper.__name__, args, entry ))
+                else:
+                    log.log( log_at, "{} Memoizing {!r} == {!r}".format( wrapper.__name__, args, entry ))
 
+            with wrapper._lock:
+                wrapper._memo[args] = entry
+                _,hits		= wrapper._stat.get( args, (now,0) )
+                wrapper._stat[args] = (now,hits+1)
+                prune( now )
+            return entry
+
+        def prune( now ):
+            """With wrapper._lock held, eject the lowest rated entries if the memo exceeds maxsize."""
             if maxsize and len( wrapper._memo ) > maxsize:
                 # Prune size, by ranking each entry by hits/age.  Something w/:
                 #
@@ -386,16 +414,18 @@ def memoize( maxsize=None, maxage=None, log_at=None ):
                     #     wrapper.__name__, key, wrapper._memo[key], rtg, wrapper._stat[key] ))
                     del wrapper._stat[key]
                     del wrapper._memo[key]
-            return entry
 
         wrapper._memo	= dict()		# { args: entry, ... }
         wrapper._stat	= dict()		# { args: (<timestamp>, <count>), ... }
+        wrapper._lock	= threading.Lock()  # Protects _memo and _stat
 
         def stats( predicate=None, now=None ):
             if now is None:
                 now		= timer()
+            with wrapper._lock:
+                items		= list( wrapper._stat.items() )
             cnt,age,avg		= 0,0,0
-            for key,(last,hits) in wrapper._stat.items():
+            for key,(last,hits) in items:
                 if not predicate or predicate( *key ):
                     cnt	       += 1
                     age	       += now-last
@@ -425,6 +455,8 @@ class Duration( datetime.timedelta ):
     HR				=     3600
     MN				=       60
 
+    POW10			= ( 1, 10, 100, 1000, 10000, 100000, 1000000 )
+
     @classmethod
     def _format( cls, delta, detail=False ):
         if detail:
@@ -435,109 +467,181 @@ class Duration( datetime.timedelta ):
                 return "{a}{l}".format( a=amount, l=label[0] )
         seconds			= delta.days * cls.DY + delta.seconds
         microseconds		= delta.microseconds
-        result			= ''
+        result			= []
 
-        years			= seconds // cls.YR
+        years, s		= divmod( seconds, cls.YR )
         if years:
-            result             += abbrev( years, 'year' )
-        y_secs			= seconds % cls.YR
-
-        weeks			= y_secs // cls.WK
+            result.append( abbrev( years, 'year' ))
+        weeks, s		= divmod( s, cls.WK )
         if weeks:
-            result             += abbrev( weeks, 'week' )
-        w_secs			= y_secs % cls.WK
-
-        days			= w_secs // cls.DY
+            result.append( abbrev( weeks, 'week' ))
+        days, s			= divmod( s, cls.DY )
         if days:
-            result             += abbrev( days, 'day' )
-        d_secs			= w_secs % cls.DY
-
-        hours			= d_secs // cls.HR
+            result.append( abbrev( days, 'day' ))
+        hours, s		= divmod( s, cls.HR )
         if hours:
-            result             += abbrev( hours, 'hour' )
-        h_secs			= d_secs % cls.HR
-
-        minutes			= h_secs // cls.MN
+            result.append( abbrev( hours, 'hour' ))
+        minutes, s		= divmod( s, cls.MN )
         if minutes:
-            result             += abbrev( minutes, 'minute' )
+            result.append( abbrev( minutes, 'minute' ))
 
-        s			= h_secs % cls.MN
-        is_us			= microseconds  % 1000 > 0
-        is_ms			= microseconds // 1000 > 0
-        if is_ms and ( s > 0 or is_us ):
+        # The sub-second encodings are simple integer conversions; %-formatting avoids the
+        # str.format keyword/format-spec machinery (about 2x faster for each).
+        ms, us			= divmod( microseconds, 1000 )
+        if ms and ( s > 0 or us ):
             # s+us or both ms and us resolution; default to fractional
-            result	       += "{s}.{us:0>6}".format( us=microseconds, s=s ).rstrip( '0' ) + 's'
+            result.append( ( "%d.%06d" % ( s, microseconds )).rstrip( '0' ) + 's' )
         elif microseconds > 0 or s > 0:
             # s or sub-seconds remain; auto-scale to s/ms/us; the finest precision w/ data.
             if s:
-                result         += "{s}s".format( s=s )
-            if is_us:
-                result         += "{us}us".format( us=microseconds )
-            elif is_ms:
-                result         += "{ms}ms".format( ms=microseconds // 1000 )
+                result.append( "%ds" % s )
+            if us:
+                result.append( "%dus" % microseconds )
+            elif ms:
+                result.append( "%dms" % ms )
         elif microseconds == 0 and seconds == 0:
             # A zero duration
-            result	       += "0s"
+            result.append( "0s" )
         else:
             # A non-empty duration w/ no remaining seconds output above; nothing left to do
             pass
-        return result
+        return ''.join( result )
 
     DURSPEC_RE			= re.compile(
         flags=re.IGNORECASE | re.VERBOSE,
         pattern=r"""
             ^
-            (?:\s*(?P<y>\d+)\s*y((((ea)?r)s?)?)?)? # y|yr|yrs|year|years
-            (?:\s*(?P<w>\d+)\s*w((((ee)?k)s?)?)?)?
-            (?:\s*(?P<d>\d+)\s*d((((a )?y)s?)?)?)?
-            (?:\s*(?P<h>\d+)\s*h((((ou)?r)s?)?)?)?
-            (?:\s*(?P<m>\d+)\s*m((in(ute)?)s?)?)?  # m|min|minute|mins|minutes
+            (?:\s*(?P<y>\d+)\s*(?:years?|yrs?|y))?
+            (?:\s*(?P<w>\d+)\s*(?:weeks?|wks?|w))?
+            (?:\s*(?P<d>\d+)\s*(?:days?|dys?|d))?
+            (?:\s*(?P<h>\d+)\s*(?:hours?|hrs?|h))?
+            (?:\s*(?P<m>\d+)\s*(?:minutes?|mins?|m))?
             (?:
               (?:\s* # seconds mantissa (optional) + fraction (required)
                 (?P<s_man>\d+)?
-                [.,](?P<s_fra>\d+)\s*             s((ec(ond)?)s?)?
+                [.,](?P<s_fra>\d+)\s*                (?:seconds?|secs?|s)
               )?
             | (?:
-                (?:\s*(?P<s> \d+)\s*              s((ec(ond)?)s?)?)?
-                (?:\s*(?P<ms>\d+)\s*(m|(milli))   s((ec(ond)?)s?)?)?
-                (?:\s*(?P<us>\d+)\s*(u|μ|(micro)) s((ec(ond)?)s?)?)?
-                (?:\s*(?P<ns>\d+)\s*(n|(nano))    s((ec(ond)?)s?)?)?
+                (?:\s*(?P<s> \d+)\s*                 (?:seconds?|secs?|s))?
+                (?:\s*(?P<ms>\d+)\s*(?:milli|m)      (?:seconds?|secs?|s))?
+                (?:\s*(?P<us>\d+)\s*(?:micro|u|μ)    (?:seconds?|secs?|s))?
+                (?:\s*(?P<ns>\d+)\s*(?:nano|n)       (?:seconds?|secs?|s))?
               )
             )
             \s*
             $
         """ )
 
+    # The same language as DURSPEC_RE, for a single-pass scanner: each (lower-case) unit spelling
+    # maps to its DURSPEC_RE group, and its rank; units must appear in ascending rank, at most once.
+    DURSPEC_UNITS		= dict(
+        ( unit, (rank, group) )
+        for rank, (group, units) in enumerate((
+            ( 'y',	"y yr yrs year years" ),
+            ( 'w',	"w wk wks week weeks" ),
+            ( 'd',	"d dy dys day days" ),
+            ( 'h',	"h hr hrs hour hours" ),
+            ( 'm',	"m min mins minute minutes" ),
+            ( 's',	"s sec secs second seconds" ),
+            ( 'ms',	"ms msec msecs msecond mseconds"
+                        " millis millisec millisecs millisecond milliseconds" ),
+            ( 'us',	"us usec usecs usecond useconds"
+                        " μs μsec μsecs μsecond μseconds"
+                        " micros microsec microsecs microsecond microseconds" ),
+            ( 'ns',	"ns nsec nsecs nsecond nseconds"
+                        " nanos nanosec nanosecs nanosecond nanoseconds" ),
+        ))
+        for unit in units.split()
+    )
+
+    @classmethod
+    def _scan( cls, durspec ):
+        """Scans a duration specifier in one pass, returning a dict of the DURSPEC_RE groups it would
+        match.  Each amount's unit is the whole run of letters following it, so no backtracking is
+        required.  Raises ValueError on anything unexpected; DURSPEC_RE decides those.
+
+        """
+        spec			= durspec.lower()
+        end			= len( spec )
+        groups			= {}
+        rank			= -1
+        i			= 0
+        while True:
+            while i < end and spec[i].isspace():
+                i	       += 1
+            if i == end:
+                return groups
+            j			= i
+            while j < end and spec[j].isdigit():
+                j	       += 1
+            man, fra		= spec[i:j], None
+            if j < end and spec[j] in '.,':
+                i = j		= j + 1
+                while j < end and spec[j].isdigit():
+                    j	       += 1
+                fra		= spec[i:j]
+                if not fra:
+                    raise ValueError( "Missing fraction" )
+            elif not man:
+                raise ValueError( "Missing amount" )
+            while j < end and spec[j].isspace():
+                j	       += 1
+            i			= j
+            while j < end and spec[j].isalpha():
+                j	       += 1
+            unit_rank, group	= cls.DURSPEC_UNITS[spec[i:j]]  # KeyError is a LookupError, not a ValueError
+            if unit_rank <= rank:
+                raise ValueError( "Unit {unit} out of order".format( unit=spec[i:j] ))
+            rank		= unit_rank
+            if fra is not None:
+                if group != 's':
+                    raise ValueError( "Fractional {unit}".format( unit=spec[i:j] ))
+                groups['s_man'], groups['s_fra'] = man, fra
+                rank		= len( cls.DURSPEC_UNITS )  # No ms/us/ns may follow fractional seconds
+            else:
+                groups[group]	= man
+            i			= j
+
     @classmethod
     def _parse( cls, durspec ):
         """Parses a duration specifier, returning the matching timedelta"""
-        durmatch		= cls.DURSPEC_RE.match( durspec )
-        if not durmatch:
-            raise RuntimeError("Invalid duration specification: {durspec}".format( durspec=durspec ))
+        try:
+            groups		= cls._scan( durspec )
+        except (ValueError, LookupError):
+            durmatch		= cls.DURSPEC_RE.match( durspec )
+            if not durmatch:
+                raise RuntimeError("Invalid duration specification: {durspec}".format( durspec=durspec ))
+            groups		= durmatch.groupdict()
         seconds			= (
-            int( durmatch.group( 's' ) or durmatch.group( 's_man' ) or 0 )
-            + cls.MN * int( durmatch.group( 'm' ) or '0' )
-            + cls.HR * int( durmatch.group( 'h' ) or '0' )
-            + cls.DY * int( durmatch.group( 'd' ) or '0' )
-            + cls.WK * int( durmatch.group( 'w' ) or '0' )
-            + cls.YR * int( durmatch.group( 'y' ) or '0' )
+            int( groups.get( 's' ) or groups.get( 's_man' ) or 0 )
+            + cls.MN * int( groups.get( 'm' ) or '0' )
+            + cls.HR * int( groups.get( 'h' ) or '0' )
+            + cls.DY * int( groups.get( 'd' ) or '0' )
+            + cls.WK * int( groups.get( 'w' ) or '0' )
+            + cls.YR * int( groups.get( 'y' ) or '0' )
         )
+        # Scale a fraction of seconds to microseconds; any digits beyond microseconds are truncated
+        fraction		= groups.get( 's_fra' )
         microseconds		= (
-            int( "{:0<6}".format( durmatch.group( 's_fra' ) or '0' ))
-            + int( durmatch.group( 'ms' ) or '0' )  * 1000
-            + int( durmatch.group( 'us' ) or '0' )
-            + int( durmatch.group( 'ns' ) or '0' ) // 1000
+            ( int( fraction[:6] ) * cls.POW10[6 - len( fraction[:6] )] if fraction else 0 )
+            + int( groups.get( 'ms' ) or '0' )  * 1000
+            + int( groups.get( 'us' ) or '0' )
+            + int( groups.get( 'ns' ) or '0' ) // 1000
         )
         return datetime.timedelta( seconds=seconds, microseconds=microseconds )
 
     def __new__( cls, value = None ):
-        """Construct a Duration from something convertible into a datetime.timedelta.
+        """Construct a Duration from something convertible into a datetime.timedelta.  Numeric seconds
+        are handed straight to datetime.timedelta (which normalizes/rounds them), and an existing
+        (immutable) Duration is simply returned.
 
         """
+        if type( value ) is cls:
+            return value
+        if isinstance( value, (int,float) ):
+            return datetime.timedelta.__new__( cls, seconds=value )
         if isinstance( value, type_str_base ):
             value		= cls._parse( value )
-        if isinstance( value, (int,float) ):
-            value		= datetime.timedelta( seconds=value )
         assert isinstance( value, datetime.timedelta ), \
             "Cannot construct a Duration from a {value!r}".format( value=value )
         # The value is (now) a datetime.timedelta; copy it's internals.
@@ -580,9 +684,18 @@ class Duration( datetime.timedelta ):
         return Duration( super( Duration, self ).__sub__( rhs ))
 
 
+HHMMSS_PAT			= r'(\d*):(\d{2})(?::(\d{2}(?:\.\d+)?))?'
+HHMMSS_RE			= re.compile(		# ie. .fullmatch (Python3.4+), w/ optional whitespace
+    flags=re.IGNORECASE | re.VERBOSE, pattern=r'^\s*{pattern}\s*$'.format( pattern=HHMMSS_PAT ))
+
+
+@memoize( maxsize=1024 )
 def parse_seconds( seconds ):
     """Convert an <int>, <float>, "<float>", "[HHH]:MM[:SS[.sss]]", "1m30s" or a Duration to a float number of seconds.
 
+    The same few duration specifications are parsed repeatedly (eg. on every License load), so
+    results are memoized; they are immutable floats.
+
     """
     if isinstance( seconds, datetime.timedelta ):       # <timedelta>, <Duration>
         return seconds.total_seconds()
@@ -590,25 +703,12 @@ def parse_seconds( seconds ):
         return float( seconds )
     except ValueError:
         pass
-    try:						# 'HHH:MM[:SS[.sss]]'
-        return math.fsum(
-            map(
-                lambda p: p[0] * p[1],
-                zip(
-                    [ 60*60, 60, 1 ],
-                    map(
-                        lambda i: float( i or 0 ),
-                        parse_seconds.HHMMSS_RE.search( seconds ).groups()
-                    )
-                )
-            )
-        )
-    except Exception:					# '1m30s'
-        pass
-    return Duration( seconds ).total_seconds()
-parse_seconds.HHMMSS_PAT	= r'(\d*):(\d{2})(?::(\d{2}(?:\.\d+)?))?'  # noqa: E305
-parse_seconds.HHMMSS_RE		= re.compile(
-    flags=re.IGNORECASE | re.VERBOSE, pattern=parse_seconds.HHMMSS_PAT )
+    hhmmss			= HHMMSS_RE.match( seconds )
+    if hhmmss:						# 'HHH:MM[:SS[.sss]]'
+        # The hours/minutes terms are integral (exact), so only the final + rounds, like math.fsum
+        hh, mm, ss		= hhmmss.groups()
+        return float( hh or 0 ) * 3600 + float( mm ) * 60 + float( ss or 0 )
+    return Duration( seconds ).total_seconds()		# '1m30s'
 
 
 #
@@ -616,21 +716,100 @@ parse_seconds.HHMMSS_RE		= re.compile(
 #
 # NOTE: Does *not* support the ambiguous timezone abbreviations! (eg. MST/MDT instead of Canada/Mountain)
 #
+DATETIME_PAT			= r"""
+        # YYYY-MM-DDTHH:MM:SS.sss+ZZ:ZZ
+        (?P<dt>[0-9-]+(?:[ T][0-9:\.\+\-]+)?)
+        # Optionally, whitespace followed by a Blah[/Blah] Timezone name, eg. Canada/Mountain
+        (?:\s+
+          (?P<tz>[a-z_-]+(?:/[a-z_-]*)*)
+        )?
+    """
+DATETIME_RE			= re.compile(
+    flags	= re.IGNORECASE | re.VERBOSE,
+    pattern	= r"""
+        ^
+        \s*
+        {pattern}
+        \s*
+        $
+    """.format( pattern=DATETIME_PAT ))
+DATETIME_OFFSET_RE		= re.compile( r'[+-]\d\d:?\d\d$' )
+DATETIME_ISO_RE			= re.compile(		# A strict ISO 8601 subset; safe for datetime.fromisoformat
+    r'[0-9]{4}-[0-9]{2}-[0-9]{2}(?:[T ][0-9]{2}:[0-9]{2}(?::[0-9]{2}(?:\.[0-9]{1,6})?)?)?$' )
+datetime_fromisoformat		= getattr( datetime.datetime, 'fromisoformat', None )  # Python3.7+
+DATETIME_FORMATS		= {
+    # (<date/time separator>, <fraction>, <':' count>, <offset>): <format>
+    ('T',  True,  2, True  ):	"%Y-%m-%dT%H:%M:%S.%f%z",
+    ('T',  False, 2, True  ):	"%Y-%m-%dT%H:%M:%S%z",
+    (' ',  True,  2, True  ):	"%Y-%m-%d %H:%M:%S.%f%z",
+    (' ',  False, 2, True  ):	"%Y-%m-%d %H:%M:%S%z",
+    ('T',  True,  2, False ):	"%Y-%m-%dT%H:%M:%S.%f",
+    ('T',  False, 2, False ):	"%Y-%m-%dT%H:%M:%S",
+    (' ',  True,  2, False ):	"%Y-%m-%d %H:%M:%S.%f",
+    (' ',  False, 2, False ):	"%Y-%m-%d %H:%M:%S",
+    (' ',  False, 1, False ):	"%Y-%m-%d %H:%M",
+    ('',   False, 0, False ):	"%Y-%m-%d",
+}
+
+
+def timezone( name ):
+    """Return the named pytz timezone, remembering each one found.  Each pytz.timezone call validates
+    and normalizes the name before consulting its own cache; this is a simple dict lookup."""
+    try:
+        return timezone.zones[name]
+    except KeyError:
+        pass
+    tz = timezone.zones[name]	= pytz.timezone( name )
+    return tz
+timezone.zones			= {}  # noqa: E305
+
+
 def parse_datetime( time, zone=None ):
     """Interpret the time string "2019/01/20 10:00" as a naive local time, in the specified time zone,
     eg. "Canada/Mountain" (default: "UTC").  Returns the datetime; default time zone: UTC.  If a
     timezone name follows the datetime, use it instead of zone/'UTC'.
 
+    The resultant (immutable) timezone-aware datetime is memoized by (time, zone).
+
     """
-    tz			= pytz.timezone( zone or 'UTC' )
+    return parse_datetime_memo( time, zone )
+
+
+@memoize( maxsize=1024 )
+def parse_datetime_memo( time, zone ):
     # First, see if we can split out datetime and a specific timezone.  If not, just try
-    # patterns against the supplied time string, unmodified, and default tz to zone/UTC.
-    dtzmatch		= parse_datetime.DATETIME_RE.match( time )
+    # patterns against the supplied time string, unmodified, and default tz to zone/UTC.  Only
+    # the one applicable timezone is looked up.
+    dtzmatch		= DATETIME_RE.match( time )
     if dtzmatch:
         time		= dtzmatch.group( 'dt' )
-        zone		= dtzmatch.group( 'tz' )
-        if zone:
-            tz		= pytz.timezone( str( zone ))
+        if dtzmatch.group( 'tz' ):
+            zone	= str( dtzmatch.group( 'tz' ))
+    tz			= timezone( zone or 'UTC' )
+
+    # The structure of the time (its date/time separator, fraction, number of ':' and any numeric
+    # timezone offset) usually identifies the one format to try, avoiding strptime raising (and us
+    # catching) an Exception for each format that doesn't match, below.
+    offset		= DATETIME_OFFSET_RE.search( time, 10 )
+    body		= time[:offset.start()] if offset else time
+    fmt			= DATETIME_FORMATS.get(( body[10:11], '.' in body, body.count( ':' ), bool( offset )))
+    if fmt:
+        # Python3.7+ parses ISO 8601 much faster than strptime, but (depending on the version) also
+        # accepts other forms; only use it for the unambiguous subset (and some offset) we support.
+        # Earlier versions accept only 3 or 6 fraction digits, and an offset w/ a ':'; use strptime.
+        if datetime_fromisoformat and DATETIME_ISO_RE.match( body ):
+            try:
+                dt		= datetime_fromisoformat( time )
+            except ValueError:
+                pass
+            else:
+                return dt.astimezone( tz ) if offset else tz.localize( dt )
+        try:
+            dt		= datetime.datetime.strptime( time, fmt )
+        except Exception:
+            pass
+        else:
+            return dt.astimezone( tz ) if offset else tz.localize( dt )
 
     # Then, try parsing some time formats w/ timezone data, and convert to the designated timezone
     for fmt in [
@@ -659,23 +838,6 @@ def parse_datetime( time, zone=None ):
             pass
     raise RuntimeError("Couldn't parse datetime from {time!r} w/ time zone {tz!r}".format(
         time=time, tz=tz ))
-parse_datetime.DATETIME_PAT	= r"""
-        # YYYY-MM-DDTHH:MM:SS.sss+ZZ:ZZ
-        (?P<dt>[0-9-]+([ T][0-9:\.\+\-]+)?)
-        # Optionally, whitespace followed by a Blah[/Blah] Timezone name, eg. Canada/Mountain
-        (?:\s+
-          (?P<tz>[a-z_-]+(/[a-z_-]*)*)
-        )?
-    """							# noqa: E305
-parse_datetime.DATETIME_RE	= re.compile(
-    flags	= re.IGNORECASE | re.VERBOSE,
-    pattern	= r"""
-        ^
-        \s*
-        {pattern}
-        \s*
-        $
-    """.format( pattern=parse_datetime.DATETIME_PAT ))
 
 
 #
@@ -686,13 +848,28 @@ CONFIG_BASE			= 'crypto-licensing'
 CONFIG_FILE			= CONFIG_BASE+'.cfg'    # Default application configuration file
 
 
+class LocalZone( object ):
+    """A class attribute that defers get_localzone until first accessed, and then replaces itself (in
+    the class that defined it) with the local timezone found.  Avoids any timezone configuration
+    discovery at import, for programs that never render a local time.
+
+    """
+    def __get__( self, instance, owner ):
+        loc			= get_localzone()
+        for cls in owner.__mro__:
+            for name, value in vars( cls ).items():
+                if value is self:
+                    setattr( cls, name, loc )
+        return loc
+
+
 class Timestamp( datetime.datetime ):
     """A simple Timestamp that can be specified from a Timestamp or datetime.datetime, and is always
     local to a specific timezone, and formats simply and deterministically.
 
     """
     UTC				= pytz.UTC
-    LOC				= get_localzone()       # from environment TZ, /etc/timezone, etc.
+    LOC				= LocalZone()		# from environment TZ, /etc/timezone, etc. (when first used)
 
     _precision			= 3			# How many default sub-second digits
     _epsilon			= 10 ** -_precision     # How small a difference to consider ==
@@ -706,6 +883,24 @@ class Timestamp( datetime.datetime ):
 
     def __new__( cls, *args, **kwds ):
         """Since datetime.datetime is immutable, we must use __new__ and return one."""
+        if len( args ) == 1 and set( kwds ) <= {'tzinfo'}:
+            # Fast path for the usual Timestamp( <numeric|datetime>[, tzinfo=...] ); see below.
+            value		= args[0]
+            tz			= kwds.get( 'tzinfo' )
+            if tz is None:
+                tz		= cls.UTC
+            dt			= None
+            if isinstance( value, (int,float) ):
+                dt		= datetime.datetime.fromtimestamp( value, tz=tz )
+            elif isinstance( value, datetime.datetime ):
+                if type( value ) is not datetime.datetime:
+                    # eg. a Timestamp; pytz's fromutc would use its (slow, ~equal) operators
+                    value	= datetime.datetime.combine( value.date(), value.timetz() )
+                dt		= value.astimezone( tz )
+            if dt is not None:
+                return datetime.datetime.__new__(
+                    cls, dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, dt.microsecond, tz )
+
         kargs			= dict( zip(
             ('year', 'month', 'day', 'hour', 'minute', 'second', 'microsecond', 'tzinfo' ), args ))
         assert len( kargs ) == len( args ), \
@@ -756,12 +951,15 @@ class Timestamp( datetime.datetime ):
         subsecond		= self._precision if ms is True else int( ms ) if ms else 0
         assert 0 <= subsecond <= 6, \
             "Invalid sub-second precision; must be 0-6 digits"
-        value			= round( self.timestamp(), subsecond ) if subsecond else self.timestamp()
         tz			= tzinfo or self.LOC    # default to local timezone
-        dt			= super( Timestamp, self ).astimezone( tz )
+        # Convert a plain datetime.datetime; a pytz tzinfo's fromutc would otherwise do its
+        # arithmetic and bisect its transitions using our (much slower, ~equal) Timestamp operators.
+        dt			= datetime.datetime.combine( self.date(), self.timetz() ).astimezone( tz )
         result			= dt.strftime( self._fmt )
         if subsecond:
-            result	       += ( '%.*f' % ( subsecond, value ))[-subsecond-1:]
+            # Round the microseconds to the sub-second precision (but don't carry into the seconds)
+            scale		= 10 ** ( 6 - subsecond )
+            result	       += '.%0*d' % ( subsecond, ( dt.microsecond + scale // 2 ) // scale % 10 ** subsecond )
         if tz is not self.UTC or tzdetail is not None:
             if isinstance( tzdetail, (bool, type_str_base, type(None)) ):
                 if tzdetail is None or bool( tzdetail ):
@@ -790,11 +988,19 @@ class Timestamp( datetime.datetime ):
         Convert the time to a UTC time tuple, then use calendar.timegm to take a UTC time tuple and
         compute the UNIX timestamp.
 
+        Since a Timestamp is immutable, the result is remembered; comparisons use it repeatedly.
+
         """
         try:
-            return super( Timestamp, self ).timestamp()
+            return self._ts
+        except AttributeError:
+            pass
+        try:
+            ts			= super( Timestamp, self ).timestamp()
         except AttributeError:
-            return calendar.timegm( self.utctimetuple() ) + self.microsecond / 1000000
+            ts			= calendar.timegm( self.utctimetuple() ) + self.microsecond / 1000000
+        self._ts		= ts
+        return ts
 
     # Comparisons.  Always equivalent to lexicographically, in UTC to 3 decimal places.  However,
     # we'll compare numerically, to avoid having to render/compare strings; if the <self>.value is
@@ -864,7 +1070,7 @@ class Timestamp( datetime.datetime ):
 
 
 def config_paths( filename, extra=None ):
-    """Yield the configuration search paths in *reverse* order of precedence (furthest or most
+    """Return the configuration search paths in *reverse* order of precedence (furthest or most
     general eg. /etc/..., to nearest or most specific, eg. ./...).
 
     This is the order that is required by configparser; settings configured in "later" files
@@ -881,12 +1087,25 @@ def config_paths( filename, extra=None ):
     other 'extra' directories are provided, is to allow the caller to *avoid* searching/writing
     in/to the current directory!  Include '.' somewhere in 'extras' if this is appropriate.
 
+    The paths depend only on the filename, the extras and the user's APPDATA/home directory, so the
+    resultant tuple is memoized on those.
+
     """
-    yield os.path.join( os.getenv( 'APPDATA', os.sep + 'etc' ), filename )      # global app data dir, eg. /etc/ (most general)
-    yield os.path.join( os.path.expanduser( '~' ), '.'+CONFIG_BASE, filename )  # user dir, ~username/.crypto-licensing/name
-    yield os.path.join( os.path.expanduser( '~' ), '.' + filename )		# user dir, ~username/.name
-    for e in ( [ '.' ] if extra is None else extra ):				# any extra dirs...
-        yield os.path.join( e, filename )					# default; relative to current working dir (most specific)
+    return config_paths_memo(
+        filename, None if extra is None else tuple( extra ),
+        os.getenv( 'APPDATA', os.sep + 'etc' ), os.path.expanduser( '~' ))
+
+
+@memoize( maxsize=256 )
+def config_paths_memo( filename, extra, appdata, home ):
+    return (
+        os.path.join( appdata, filename ),			# global app data dir, eg. /etc/ (most general)
+        os.path.join( home, '.'+CONFIG_BASE, filename ),  # user dir, ~username/.crypto-licensing/name
+        os.path.join( home, '.' + filename ),			# user dir, ~username/.name
+    ) + tuple(
+        os.path.join( e, filename )  # any extra dirs; default: relative to current working dir (most specific)
+        for e in ( [ '.' ] if extra is None else extra )
+    )
 
 
 try:
@@ -899,6 +1118,29 @@ class ConfigFoundError( KeyError ):
     pass
 
 
+def config_glob( pattern ):
+    """Yield the regular files matching a glob pattern.  If only the final path component contains
+    any glob magic, its directory is scanned just once w/ scandir, testing each name w/ fnmatch
+    (ignoring hidden names, unless the pattern also starts w/ '.', like glob).  Otherwise, uses
+    glob.iglob.
+
+    """
+    dirname, basename		= os.path.split( pattern )
+    if scandir is None or glob.has_magic( dirname ):
+        for gn in glob.iglob( pattern ):
+            yield gn
+        return
+    try:
+        entries			= list( scandir( dirname or os.curdir ))
+    except OSError:
+        return
+    hidden			= basename.startswith( '.' )
+    for entry in entries:
+        if ( hidden or not entry.name.startswith( '.' )) \
+           and fnmatch.fnmatch( entry.name, basename ) and entry.is_file():
+            yield os.path.join( dirname, entry.name )
+
+
 def config_open( name, mode=None, extra=None, skip=None, reverse=None, overwrite=None, **kwds ):
     """Find and open all glob-matched file name(s) found on the standard or provided configuration
     file paths (plus any extra), for reading in most specific to most general order (or in 'reverse'
@@ -957,14 +1199,20 @@ def config_open( name, mode=None, extra=None, skip=None, reverse=None, overwrite
         if extra:
             log.warning( "Ignoring specified extra search paths: {extra}".format( extra=', '.join( extra )))
     else:
-        search			= list( config_paths( name, extra=extra ))
+        search			= config_paths( name, extra=extra )  # a (memoized) tuple; don't mutate
         if reverse:
-            search.reverse()
+            search		= search[::-1]
     log.debug( "config_open {}ing paths: {}".format( 'Writ' if is_writing else 'Read', ', '.join( search )))
     for fn in search:
         log.trace( "config_open search {fn!r}{globbing}".format(
             fn=fn, globbing=" w/ globbing" if is_globbing else "" ))
-        for gn in sorted( filtered( glob.iglob( fn ) if is_globbing else [ fn ] )):
+        if is_globbing:
+            found		= config_glob( fn )
+        elif is_writing or os.path.isfile( fn ):
+            found		= [ fn ]
+        else:
+            continue  # Not a file; skip the failing open (and its Exception, logging) for reading
+        for gn in sorted( filtered( found )):
             if is_writing and ( not overwrite ) and os.path.exists( gn ):
                 log.info( "config_open refuse {fn!r} in mode {mode!r}; will not overwrite existing file".format(
                     fn=fn, mode=mode ))
@@ -989,7 +1237,15 @@ def deduce_name( basename=None, extension=None, filename=None, package=None ):
     An absolute path 'basename' will remain unchanged.  If no extension is present, the supplied
     'extension' will be appended.
 
+    The same few names are deduced repeatedly (eg. on every config_open_deduced), so each result is
+    remembered.  This is a plain dict lookup, because it's cheaper than the @memoize bookkeeping.
+
     """
+    key				= ( basename, extension, filename, package )
+    try:
+        return deduce_name.names[key]
+    except KeyError:
+        pass
     assert basename or ( filename or package ), \
         "Cannot deduce basename without either filename (__file__) or package (__package__)"
     if basename is None:
@@ -1006,7 +1262,9 @@ def deduce_name( basename=None, extension=None, filename=None, package=None ):
         if extension[0] != '.':
             name	       += '.'
         name		       += extension
+    deduce_name.names[key]	= name
     return name
+deduce_name.names		= {}  # noqa: E305
 
 
 def config_open_deduced( basename=None, extension=None, filename=None, package=None, **kwds ):
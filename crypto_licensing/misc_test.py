@@ -7,11 +7,15 @@ except ImportError:
     pass
 
 import datetime
+import glob
 import json
 import logging
+import os
 import pytest
 import pytz
 import random
+import sys
+import threading
 import time
 
 try:
@@ -20,7 +24,7 @@ except ImportError:
     lru_cache			= None
 
 from .misc		import (
-    parse_datetime, parse_seconds, Timestamp, Duration, memoize, timer, gray
+    parse_datetime, parse_seconds, Timestamp, Duration, memoize, timer, gray, config_glob, config_paths
 )
 
 log				= logging.getLogger( "misc_test" )
@@ -34,17 +38,34 @@ def test_Duration():
     assert repr( d+123456789 ) == "3 years 47 weeks 4 days 3 hours 34 minutes 42.123s"
     assert str( d+123456789 ) == "3y47w4d3h34m42.123s"
 
+    assert Duration( "1.5s" ).microseconds == 500000
+    assert Duration( "1.2345678s" ) == Duration( "1.234567s" )  # beyond microseconds; truncated
+
+    # The single-pass scanner and DURSPEC_RE must agree on what they both accept
+    for spec in ( "1m33s123ms", " 1 Year 2wks 3d 4HRS 5 mins 6.75 seconds ", ",5s", "7ms 8us 9ns", "" ):
+        groups		= Duration._scan( spec )
+        assert all(
+            groups.get( k ) == v
+            for k, v in Duration.DURSPEC_RE.match( spec ).groupdict().items()
+            if v is not None
+        ), spec
+    for spec in ( "1s1m", "1.5m", "1.5s2ms", "1 ms s", "1mx" ):
+        with pytest.raises( RuntimeError ):
+            Duration( spec )
+
 
 def test_Timestamp( monkeypatch ):
     monkeypatch.setattr( Timestamp, 'LOC', pytz.timezone( "Canada/Mountain" ))
 
     dt			= parse_datetime( "2021-01-01 00:00:00.1 Canada/Pacific" )
     assert isinstance( dt, datetime.datetime )
+    assert parse_datetime( "2021-01-01 00:00:00.1 Canada/Pacific" ) is dt  # memoized
 
     ts_dt		= Timestamp( dt )
     assert isinstance( ts_dt, Timestamp )
     assert isinstance( ts_dt, datetime.datetime )
     assert ts_dt.timestamp() == 1609488000.1
+    assert ts_dt.timestamp() is ts_dt.timestamp()  # remembered
 
     ts_int		= Timestamp( 0 )
     assert isinstance( ts_int, Timestamp )
@@ -69,6 +90,9 @@ def test_Timestamp( monkeypatch ):
     assert parse_seconds(    "0:01" ) == 60.0
     assert parse_seconds(   "01:01" ) == 3660.0		# as a HH:MM time tuple
     assert parse_seconds( "0:01:01.33" ) == 61.33
+    assert parse_seconds( " 0:01:01.33 " ) == 61.33
+    with pytest.raises( RuntimeError ):
+        parse_seconds( "0:01:01.33 junk" )             # must match entire time spec
     assert str( ts_dt + parse_seconds( "0:01:01.33" )) == "2021-01-01 01:01:01.430 Canada/Mountain"
     assert str( ts_dt - parse_seconds( "61.33" )) == "2021-01-01 00:58:58.770 Canada/Mountain"
     assert str( ts_dt - parse_seconds( "1m1s330000us" )) == "2021-01-01 00:58:58.770 Canada/Mountain"
@@ -128,6 +152,28 @@ def test_Timestamp( monkeypatch ):
     assert( ts_dt         <=   ts_dt_m499us )
 
 
+def test_parse_datetime():
+    for spec, iso in (
+        ( "2021-01-01",				"2021-01-01T00:00:00+00:00" ),
+        ( "2021-01-01 01:02",			"2021-01-01T01:02:00+00:00" ),
+        ( "2021-01-01T01:02:03.4",		"2021-01-01T01:02:03.400000+00:00" ),
+        ( "2021-01-01 01:02:03-07:00",		"2021-01-01T08:02:03+00:00" ),
+        ( "2021-01-01T01:02:03.4+0100",		"2021-01-01T00:02:03.400000+00:00" ),
+        ( "2021-01-01 01:02:03 Canada/Mountain",	"2021-01-01T01:02:03-07:00" ),
+    ):
+        assert parse_datetime( spec ).isoformat() == iso
+
+
+def test_config_glob( tmp_path ):
+    for name in ( "a.crypto-keypair", "b.crypto-keypair-plaintext", ".c.crypto-keypair", "d.crypto-license" ):
+        ( tmp_path / name ).write_text( u"{}" )
+    ( tmp_path / "e.crypto-keypair" ).mkdir()
+    for pattern in ( "*.crypto-keypair*", ".*.crypto-keypair", "*.crypto-license", "*.none" ):
+        pattern			= str( tmp_path / pattern )
+        assert sorted( config_glob( pattern )) \
+            == sorted( gn for gn in glob.glob( pattern ) if not gn.endswith( "e.crypto-keypair" ))
+
+
 memoize_count		= 1000000
 
 
@@ -252,3 +298,59 @@ def test_memoize():
                 print( "    |{}|    |{}|".format( used, ages ))
             print( "    +{}+    +{}+".format( '-' * 30, '-' * 30 ))
     print( json.dumps( stats, indent=4 ))
+
+
+def threaded( probe, count=8 ):
+    """Run probe( rng ) in count concurrent Threads, switching between them as often as possible.
+    Returns any Exceptions raised."""
+    failures			= []
+
+    def attempt( seed ):
+        try:
+            probe( random.Random( seed ))
+        except Exception as exc:
+            failures.append( exc )
+
+    switching			= getattr( sys, 'getswitchinterval', None )
+    if switching:
+        interval		= sys.getswitchinterval()
+        sys.setswitchinterval( 1e-6 )
+    try:
+        threads			= [ threading.Thread( target=attempt, args=(seed,) ) for seed in range( count ) ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        if switching:
+            sys.setswitchinterval( interval )
+    return failures
+
+
+def test_memoize_threads():
+    """Concurrent Threads may share a memoized function, even while it is ejecting entries."""
+    @memoize( maxsize=16 )
+    def square( x ):
+        return x * x
+
+    def probe( rng ):
+        for _ in range( 2000 ):
+            x			= rng.randrange( 100 )
+            assert square( x ) == x * x
+            square.stats()
+
+    failures			= threaded( probe )
+    assert not failures, "Memoize failed in Threads: {}".format( failures[:3] )
+    assert len( square._memo ) == len( square._stat ) <= 16
+
+
+def test_config_paths_threads():
+    """The memoized config_paths may be used by concurrent (eg. web request) Threads."""
+    def probe( rng ):
+        for _ in range( 500 ):
+            extra		= [ "extra-{}".format( rng.randrange( 1000 )) ]
+            paths		= config_paths( "name", extra )
+            assert paths[-1] == os.path.join( extra[0], "name" )
+
+    failures			= threaded( probe )
+    assert not failures, "config_paths failed in Threads: {}".format( failures[:3] )